@@ -25,10 +25,17 @@ drug_interaction = st.Page(
     default = False,
 )
 
+interaction_network = st.Page(
+    page = "views/network.py",
+    title = "Interaction Network",
+    icon = ":material/hub:",
+    default = False,
+)
+
 pg = st.navigation(
     {
         "Info": [about_dev, about_project],
-        "Drug Search": [drug_interaction],
+        "Drug Search": [drug_interaction, interaction_network],
         
     }
 )
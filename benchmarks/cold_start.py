@@ -0,0 +1,55 @@
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.screening import synthetic_facts
+from core.compiled import compile_source, load_compiled
+from core.facts import FIELDS, load_facts
+from core.index import build_index
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare knowledge-base cold start from CSV and from the compiled artifact.")
+    parser.add_argument('--drugs', type=int, default=20000)
+    parser.add_argument('--degree', type=int, default=30, help="average interactions per drug")
+    args = parser.parse_args()
+
+    drugs, facts = synthetic_facts(args.drugs, args.degree)
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'interactions.csv')
+        classes = os.path.join(tmp, 'drug_classes.csv')
+        artifact = os.path.join(tmp, 'interactions.kb')
+        with open(source, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(FIELDS)
+            writer.writerows(facts)
+        # Empty class file, so neither build picks up data/drug_classes.csv
+        with open(classes, 'w', newline='', encoding='utf-8') as f:
+            csv.writer(f).writerow(['drug', 'class'])
+
+        loaded, csv_seconds = timed(load_facts, source)
+        _, index_seconds = timed(build_index, loaded, [])
+        size, compile_seconds = timed(compile_source, source, artifact, classes)
+        backend, load_seconds = timed(load_compiled, artifact)
+        _, query_seconds = timed(backend.check_all_interactions, drugs[:50])
+
+    print(f"KB: {len(drugs)} drugs, {len(facts)} facts, artifact {size / 1e6:.1f} MB")
+    print(f"CSV parse:          {csv_seconds * 1000:9.1f} ms")
+    print(f"Index build:        {index_seconds * 1000:9.1f} ms")
+    print(f"Compile (one-off):  {compile_seconds * 1000:9.1f} ms")
+    print(f"Compiled load:      {load_seconds * 1000:9.1f} ms")
+    print(f"First 50-drug query: {query_seconds * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
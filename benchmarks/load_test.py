@@ -0,0 +1,98 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.facts import load_facts
+
+
+# --- Minimal keep-alive HTTP client ---
+async def post(reader, writer, host, path, payload):
+    body = json.dumps(payload).encode('utf-8')
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def worker(host, port, path, payloads, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for payload in payloads:
+            start = time.perf_counter()
+            status = await post(reader, writer, host, path, payload)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+def make_payloads(count, min_drugs, max_drugs, bulk, seed=0):
+    rng = random.Random(seed)
+    drugs = sorted({d for fact in load_facts() for d in fact[:2]})
+
+    def drug_list():
+        return rng.sample(drugs, rng.randint(min_drugs, max_drugs))
+
+    if bulk:
+        return [{'patients': [{'patient_id': f'p{i}-{j}', 'drugs': drug_list()} for j in range(bulk)]} for i in range(count)]
+    return [{'drugs': drug_list()} for _ in range(count)]
+
+
+async def run(args):
+    path = '/v1/check/bulk' if args.bulk else '/v1/check'
+    payloads = make_payloads(args.requests, args.min_drugs, args.max_drugs, args.bulk)
+    shards = [payloads[i::args.concurrency] for i in range(args.concurrency)]
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(args.host, args.port, path, shard, latencies, errors) for shard in shards))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    # Inclusive, so percentiles stay within the observed latencies on small runs
+    quantiles = statistics.quantiles(latencies, n=100, method='inclusive')
+    report = {
+        'endpoint': path,
+        'requests': len(latencies),
+        'concurrency': args.concurrency,
+        'errors': len(errors),
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(quantiles[49] * 1000, 3),
+        'p99_ms': round(quantiles[98] * 1000, 3),
+        'max_ms': round(latencies[-1] * 1000, 3),
+    }
+    print(json.dumps(report, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the interaction HTTP service.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--min-drugs', type=int, default=2)
+    parser.add_argument('--max-drugs', type=int, default=10)
+    parser.add_argument('--bulk', type=int, default=0, help="patients per request; 0 uses the single-check endpoint")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+import argparse
+import os
+import random
+import sys
+import timeit
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.index import SCREEN_THRESHOLD, build_index
+
+
+# --- Synthetic Knowledge Base ---
+def synthetic_facts(n_drugs, avg_degree, seed=0):
+    rng = random.Random(seed)
+    drugs = [f'drug_{i:05d}' for i in range(n_drugs)]
+    pairs = set()
+    target = n_drugs * avg_degree // 2
+    while len(pairs) < target:
+        d1, d2 = rng.sample(drugs, 2)
+        pairs.add((d1, d2) if d1 < d2 else (d2, d1))
+    severities = ['high', 'moderate', 'low']
+    facts = [(d1, d2, rng.choice(severities), 'Synthetic risk', 'Synthetic recommendation') for d1, d2 in sorted(pairs)]
+    return drugs, facts
+
+
+def time_call(func, drug_list, repeat):
+    return min(timeit.repeat(lambda: func(drug_list), number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare pairwise and adjacency screening across drug list sizes.")
+    parser.add_argument('--drugs', type=int, default=5000, help="number of drugs in the synthetic KB")
+    parser.add_argument('--degree', type=int, default=20, help="average interactions per drug")
+    parser.add_argument('--sizes', default='2,3,4,6,8,12,16,24,50,100,200', help="comma-separated drug list sizes")
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    drugs, facts = synthetic_facts(args.drugs, args.degree)
+    # No class memberships: the synthetic KB must not pick up data/drug_classes.csv
+    backend = build_index(facts, [])
+    rng = random.Random(1)
+
+    print(f"KB: {len(drugs)} drugs, {len(facts)} facts (current SCREEN_THRESHOLD = {SCREEN_THRESHOLD})")
+    print(f"{'size':>5} {'pairwise_us':>12} {'screen_us':>10} {'faster':>9}")
+    crossover = None
+    for size in [int(s) for s in args.sizes.split(',') if int(s) <= len(drugs)]:
+        drug_list = rng.sample(drugs, size)
+        if backend._check_pairs(drug_list) != backend._screen(drug_list):
+            sys.exit(f"Screening result differs from pairwise result for size {size}")
+        pairwise = time_call(backend._check_pairs, drug_list, args.repeat)
+        screen = time_call(backend._screen, drug_list, args.repeat)
+        faster = 'screen' if screen < pairwise else 'pairwise'
+        if faster == 'screen' and crossover is None:
+            crossover = size
+        print(f"{size:>5} {pairwise * 1e6:>12.1f} {screen * 1e6:>10.1f} {faster:>9}")
+    print(f"Crossover: screening is faster from {crossover} drugs" if crossover else "Crossover: not reached")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,270 @@
+import argparse
+import json
+import os
+import platform
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.screening import synthetic_facts
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+LIST_SIZES = [2, 5, 10, 20, 50, 100, 200]
+QUERIES_PER_SIZE = 200
+BATCH_PATIENTS = 2000
+# Each stage stops early once this is spent, so slow backends still finish
+STAGE_BUDGET_SECONDS = 2.0
+MIN_SAMPLES = 1
+# Modules the pages import before (or without) rendering any result section
+IMPORT_ENTRY_POINTS = ['views.resources', 'core.backends', 'core.results', 'core.graph', 'core.regimen', 'core.auth']
+# None of these should load until a section that needs them renders
+HEAVY_MODULES = ['pandas', 'plotly.express', 'pyDatalog', 'numpy', 'pyarrow', 'pyttsx3']
+IMPORT_RUNS = 3
+# Lower-is-better metrics; everything else reported is higher-is-better
+LOWER_IS_BETTER = ('_seconds', '_ms', '_mb', '_bytes')
+
+
+def peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def latency_stats(samples):
+    samples = sorted(samples)
+    # Inclusive, so percentiles stay within the observed samples when there are few
+    quantiles = statistics.quantiles(samples, n=100, method='inclusive') if len(samples) > 1 else samples * 99
+    return {'p50_ms': quantiles[49] * 1000, 'p99_ms': quantiles[98] * 1000}
+
+
+# --- Cases (each runs in its own process so peak memory is per case) ---
+def run_backend_case(backend_name, fact_count, degree, seed):
+    from core.backends import build_backend
+    from core.compiled import compile_facts, load_compiled
+    from core.closure import materialize
+
+    n_drugs = max(2 * fact_count // degree, degree + 1)
+    drugs, facts = synthetic_facts(n_drugs, degree, seed)
+    result = {'backend': backend_name, 'facts': len(facts), 'drugs': len(drugs)}
+
+    if backend_name == 'compiled':
+        # Cold start is what matters here: compile once, then time the mmap load
+        with tempfile.TemporaryDirectory() as tmp:
+            artifact = os.path.join(tmp, 'kb.kb')
+            data, result['compile_seconds'] = timed(compile_facts, materialize(facts, []))
+            with open(artifact, 'wb') as f:
+                f.write(data)
+            del data
+            backend, result['kb_load_seconds'] = timed(load_compiled, artifact)
+            _measure_queries(backend, drugs, seed, result)
+    else:
+        backend, result['kb_load_seconds'] = timed(build_backend, backend_name, facts, [])
+        _measure_queries(backend, drugs, seed, result)
+
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+
+def _measure_queries(backend, drugs, seed, result):
+    rng = random.Random(seed)
+    for size in LIST_SIZES:
+        if size > len(drugs):
+            continue
+        samples = []
+        deadline = time.perf_counter() + STAGE_BUDGET_SECONDS
+        while len(samples) < QUERIES_PER_SIZE and (len(samples) < MIN_SAMPLES or time.perf_counter() < deadline):
+            drug_list = rng.sample(drugs, size)
+            samples.append(timed(backend.check_all_interactions, drug_list)[1])
+        for name, value in latency_stats(samples).items():
+            result[f'query_{size}_{name}'] = value
+        result[f'query_{size}_samples'] = len(samples)
+
+    patients = [rng.sample(drugs, rng.randint(2, min(20, len(drugs)))) for _ in range(BATCH_PATIENTS)]
+    start = time.perf_counter()
+    screened = 0
+    for drug_list in patients:
+        backend.check_all_interactions(drug_list)
+        screened += 1
+        if screened >= MIN_SAMPLES and time.perf_counter() - start > STAGE_BUDGET_SECONDS:
+            break
+    result['batch_patients_per_second'] = screened / (time.perf_counter() - start)
+
+
+def run_render_case(result_count, seed):
+    import pandas as pd
+    import plotly.express as px
+    from core.graph import render_graph_json
+    from core.results import ResultTable, export_bytes
+
+    rng = random.Random(seed)
+    severities = ['high', 'moderate', 'low']
+    results = [
+        {'Drug 1': f'Drug{rng.randrange(200)}', 'Drug 2': f'Drug{rng.randrange(200)}', 'Severity': rng.choice(severities),
+         'Risk': 'Synthetic risk', 'Recommendation': 'Synthetic recommendation'}
+        for _ in range(result_count)
+    ]
+    result = {'backend': 'render', 'results': result_count}
+    df, result['dataframe_seconds'] = timed(pd.DataFrame, results)
+    counts = df['Severity'].value_counts()
+    px.pie(names=counts.index, values=counts.values).to_json()  # first figure pays plotly's template setup
+    _, result['plotly_pie_seconds'] = timed(lambda: px.pie(names=counts.index, values=counts.values).to_json())
+    graph, result['graph_json_seconds'] = timed(render_graph_json, results)
+    result['graph_json_bytes'] = len(graph)
+    _, result['csv_export_seconds'] = timed(lambda: df.to_csv(index=False).encode('utf-8'))
+    table, result['result_table_seconds'] = timed(ResultTable.from_results, results)
+    for fmt in ('csv', 'jsonl', 'parquet'):
+        _, result[f'table_{fmt}_export_seconds'] = timed(export_bytes, table, fmt)
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+
+# --- Import Time (python -X importtime, on top of an already-imported streamlit) ---
+def parse_importtime(stderr):
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append((name.rstrip(), int(self_us), int(cumulative_us)))
+    return modules
+
+
+def run_import_case(module):
+    best = None
+    for _ in range(IMPORT_RUNS):
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import streamlit; import {module}'],
+                                   cwd=ROOT, env={**os.environ, 'PYTHONPATH': ROOT}, capture_output=True, text=True)
+        if completed.returncode != 0:
+            return {'backend': 'imports', 'module': module, 'error': completed.stderr.strip().splitlines()[-1:]}
+        modules = parse_importtime(completed.stderr)
+        # Everything after streamlit's own top-level entry is what `module` adds
+        start = max(i for i, (name, _, _) in enumerate(modules) if name == ' streamlit') + 1
+        added = modules[start:]
+        total = sum(self_us for _, self_us, _ in added)
+        if best is None or total < best[0]:
+            best = (total, added)
+    total, added = best
+    loaded = {name.strip() for name, _, _ in added}
+    return {
+        'backend': 'imports',
+        'module': module,
+        'import_ms': total / 1000,
+        'modules_loaded': len(added),
+        'heavy_modules': [name for name in HEAVY_MODULES if name in loaded],
+        'slowest': [{'module': name.strip(), 'self_ms': self_us / 1000}
+                    for name, self_us, _ in sorted(added, key=lambda m: -m[1])[:10]],
+    }
+
+
+# --- Runner ---
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_case_subprocess(args):
+    completed = subprocess.run([sys.executable, os.path.abspath(__file__), '--case', *args],
+                               capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {'case': args, 'error': completed.stderr.strip().splitlines()[-1:] or ['failed']}
+    return json.loads(completed.stdout)
+
+
+def compare(current, baseline_path, threshold):
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f)
+    key = lambda case: (case.get('backend'), case.get('facts'), case.get('results'), case.get('module'))
+    previous = {key(case): case for case in baseline['cases']}
+    regressions = []
+    for case in current['cases']:
+        old = previous.get(key(case))
+        if not old:
+            continue
+        for metric, value in case.items():
+            if not isinstance(value, (int, float)) or metric in ('facts', 'drugs', 'results', 'modules_loaded') or metric.endswith('_samples') or not old.get(metric):
+                continue
+            ratio = value / old[metric]
+            worse = ratio > 1 + threshold if metric.endswith(LOWER_IS_BETTER) else ratio < 1 - threshold
+            if worse:
+                regressions.append(f"{case['backend']} {case.get('facts', case.get('results', case.get('module')))}: "
+                                   f"{metric} {old[metric]:.4g} -> {value:.4g} ({ratio:.2f}x)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark KB load, query latency, batch throughput and rendering.")
+    parser.add_argument('--facts', default='1000,10000,100000,1000000', help="comma-separated synthetic KB sizes")
+    parser.add_argument('--backends', default='datalog,index,compiled')
+    parser.add_argument('--degree', type=int, default=20, help="average interactions per drug")
+    parser.add_argument('--datalog-max-facts', type=int, default=10000, help="skip larger KBs for the pyDatalog backend")
+    parser.add_argument('--render-sizes', default='10,100,1000')
+    parser.add_argument('--imports', default=','.join(IMPORT_ENTRY_POINTS), help="modules to time with -X importtime")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=os.path.join(ROOT, 'bench_results.json'))
+    parser.add_argument('--compare', help="earlier results file to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.2, help="relative change counted as a regression")
+    parser.add_argument('--case', nargs='+', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        if args.case[0] == 'render':
+            result = run_render_case(int(args.case[1]), int(args.case[2]))
+        else:
+            result = run_backend_case(args.case[0], int(args.case[1]), int(args.case[2]), int(args.case[3]))
+        print(json.dumps(result))
+        return
+
+    cases = []
+    for backend in args.backends.split(','):
+        for facts in [int(n) for n in args.facts.split(',')]:
+            if backend == 'datalog' and facts > args.datalog_max_facts:
+                continue
+            print(f"Running {backend} with {facts} facts...", file=sys.stderr)
+            cases.append(run_case_subprocess([backend, str(facts), str(args.degree), str(args.seed)]))
+    for size in [int(n) for n in args.render_sizes.split(',') if n]:
+        print(f"Running render with {size} results...", file=sys.stderr)
+        cases.append(run_case_subprocess(['render', str(size), str(args.seed)]))
+
+    for module in [m for m in args.imports.split(',') if m]:
+        print(f"Timing import of {module}...", file=sys.stderr)
+        cases.append(run_import_case(module))
+
+    report = {
+        'commit': git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cases': cases,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}", file=sys.stderr)
+
+    for case in cases:
+        if case.get('heavy_modules'):
+            print(f"WARNING importing {case['module']} loads {', '.join(case['heavy_modules'])}", file=sys.stderr)
+
+    if args.compare:
+        regressions = compare(report, args.compare, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+from core.closure import ClassHierarchy
+from core.facts import load_memberships, normalize_drug
+from core.regimen import SEVERITY_WEIGHTS, pair_score
+
+
+def bitset(ids):
+    bits = bytearray((max(ids) >> 3) + 1 if ids else 0)
+    for i in ids:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, 'little')
+
+
+# --- Same-class Substitutes ---
+class AlternativeIndex:
+    """Class members with their interaction partners as integer bitsets.
+
+    Scoring a candidate against a regimen is two ANDs and two popcounts,
+    however large the class or the regimen.
+    """
+
+    def __init__(self, backend, memberships=None):
+        memberships = load_memberships() if memberships is None else memberships
+        self.version = backend.version
+        hierarchy = ClassHierarchy(memberships)
+        # Leaf drugs only: a class name is never offered as a substitute
+        self._classes = {drug: hierarchy.ancestors(drug) - {drug} for drug in hierarchy.parents
+                         if not hierarchy.is_class(drug)}
+        self._members = {}
+        for drug, classes in self._classes.items():
+            for cls in classes:
+                self._members.setdefault(cls, set()).add(drug)
+
+        drugs = sorted(set(backend.drugs()) | set(self._classes))
+        self._ids = {drug: i for i, drug in enumerate(drugs)}
+        any_partners = {drug: [] for drug in self._classes}
+        high_partners = {drug: [] for drug in self._classes}
+        for d1, d2, outcomes in backend.pairs():
+            high = pair_score(outcomes) >= SEVERITY_WEIGHTS['high']
+            for drug, other in ((d1, d2), (d2, d1)):
+                if drug in any_partners:
+                    any_partners[drug].append(self._ids[other])
+                    if high:
+                        high_partners[drug].append(self._ids[other])
+        self._any = {drug: bitset(ids) for drug, ids in any_partners.items()}
+        self._high = {drug: bitset(ids) for drug, ids in high_partners.items()}
+
+    def classes(self, drug):
+        return sorted(self._classes.get(normalize_drug(drug), ()))
+
+    def _mask(self, drugs):
+        return bitset([self._ids[d] for d in drugs if d in self._ids])
+
+    def _score(self, drug, mask):
+        return (self._high[drug] & mask).bit_count(), (self._any[drug] & mask).bit_count()
+
+    def suggest(self, regimen, drug, limit=5):
+        """Same-class drugs with fewer high-severity (then total) hits than `drug` against the rest of `regimen`."""
+        regimen = [normalize_drug(d) for d in regimen if d.strip()]
+        drug = normalize_drug(drug)
+        if drug not in self._classes:
+            return []
+        others = [d for d in regimen if d != drug]
+        mask = self._mask(others)
+        current = self._score(drug, mask)
+        suggestions = []
+        for cls in sorted(self._classes[drug]):
+            for candidate in self._members[cls]:
+                if candidate == drug or candidate in regimen:
+                    continue
+                score = self._score(candidate, mask)
+                if score < current:
+                    suggestions.append((score, candidate, cls))
+        suggestions.sort()
+        rows, seen = [], set()
+        for (high, total), candidate, cls in suggestions:
+            if candidate in seen:
+                continue
+            seen.add(candidate)
+            conflicts = self._any[candidate]
+            rows.append({
+                'Replace': drug.title(),
+                'Alternative': candidate.title(),
+                'Class': cls.replace('_', ' ').title(),
+                'High Severity': high,
+                'Interactions': total,
+                'Still Interacts With': ', '.join(d.title() for d in others
+                                                  if d in self._ids and conflicts >> self._ids[d] & 1),
+            })
+            if len(rows) == limit:
+                break
+        return rows
+
+    def suggest_for_regimen(self, regimen, limit=5):
+        """Alternatives for every regimen drug that is part of a high-severity interaction."""
+        regimen = [normalize_drug(d) for d in regimen if d.strip()]
+        mask = self._mask(regimen)
+        suggestions = {}
+        for drug in regimen:
+            if drug in self._classes and self._high[drug] & mask & ~(1 << self._ids[drug]):
+                rows = self.suggest(regimen, drug, limit)
+                if rows:
+                    suggestions[drug.title()] = rows
+        return suggestions
@@ -0,0 +1,202 @@
+import argparse
+import csv
+import getpass
+import hashlib
+import hmac
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import deque
+
+PASSWORD_SCHEME = 'pbkdf2_sha256'
+PASSWORD_ITERATIONS = 240_000
+MAX_FAILED_LOGINS = 5
+LOGIN_WINDOW_SECONDS = 300
+SESSION_TTL_SECONDS = 8 * 60 * 60
+
+
+# --- Password Hashes: "pbkdf2_sha256$iterations$salt$hash" ---
+def hash_password(password, salt=None, iterations=PASSWORD_ITERATIONS):
+    salt = salt or secrets.token_hex(16)
+    digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt.encode('ascii'), iterations)
+    return f"{PASSWORD_SCHEME}${iterations}${salt}${digest.hex()}"
+
+
+def verify_password(password, encoded):
+    try:
+        scheme, iterations, salt, expected = encoded.split('$')
+        if scheme != PASSWORD_SCHEME:
+            return False
+        digest = hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt.encode('ascii'), int(iterations))
+    except ValueError:
+        return False
+    return hmac.compare_digest(digest.hex(), expected)
+
+
+def _iterations(encoded):
+    parts = encoded.split('$')
+    return int(parts[1]) if len(parts) == 4 and parts[1].isdigit() else 0
+
+
+def normalize_email(email):
+    return email.strip().lower()
+
+
+# --- User Store (loaded once, hashed lookup by email) ---
+class UserStore:
+    """Users by email: CSV users as stored hashes, legacy env users as plaintext until first login.
+
+    Every attempt costs exactly one hash at PASSWORD_ITERATIONS or the
+    store's own cost, whether the email is unknown, hashed or still pending,
+    so loading is instant and response time doesn't reveal who has an account.
+    """
+
+    def __init__(self, users, pending=None):
+        self._users = dict(users)
+        self._pending = {email: password for email, password in (pending or {}).items() if email not in self._users}
+        self._lock = threading.Lock()
+        costs = [_iterations(encoded) for encoded in self._users.values()]
+        if self._pending:
+            costs.append(PASSWORD_ITERATIONS)
+        self._dummy = hash_password(secrets.token_hex(8), iterations=max(costs, default=PASSWORD_ITERATIONS))
+
+    def __len__(self):
+        return len(self._users) + len(self._pending)
+
+    def __contains__(self, email):
+        email = normalize_email(email)
+        return email in self._users or email in self._pending
+
+    def authenticate(self, email, password):
+        email = normalize_email(email)
+        encoded = self._users.get(email)
+        if encoded is not None:
+            return verify_password(password, encoded)
+        expected = self._pending.get(email)
+        if expected is None:
+            verify_password(password, self._dummy)
+            return False
+        # Hashing the attempt is the one hash this login pays; on success it becomes the stored hash
+        encoded = hash_password(password)
+        if not hmac.compare_digest(hashlib.sha256(password.encode('utf-8')).digest(),
+                                   hashlib.sha256(expected.encode('utf-8')).digest()):
+            return False
+        with self._lock:
+            self._users.setdefault(email, encoded)
+            self._pending.pop(email, None)
+        return True
+
+
+def read_users_csv(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return {normalize_email(row['email']): row['password_hash'] for row in csv.DictReader(f)}
+
+
+def read_users_env():
+    # Paired by position before blanks are dropped, so an empty email doesn't shift the passwords
+    emails = os.getenv("USER_EMAILS", "").split(",")
+    passwords = os.getenv("USER_PASSWORDS", "").split(",")
+    return {normalize_email(email): password for email, password in zip(emails, passwords) if email.strip()}
+
+
+def load_user_store(path=None):
+    # USER_STORE_PATH points at a CSV of email,password_hash; the legacy
+    # plaintext env vars still work and are merged underneath it
+    path = path or os.getenv("USER_STORE_PATH")
+    users = read_users_csv(path) if path else {}
+    return UserStore(users, pending=read_users_env())
+
+
+# --- Login Rate Limiting (failed attempts per email, sliding window) ---
+class LoginRateLimiter:
+    def __init__(self, max_failures=MAX_FAILED_LOGINS, window=LOGIN_WINDOW_SECONDS):
+        self.max_failures = max_failures
+        self.window = window
+        self._failures = {}
+        self._lock = threading.Lock()
+
+    def _recent(self, key, now):
+        failures = self._failures.get(key)
+        while failures and failures[0] <= now - self.window:
+            failures.popleft()
+        if failures is not None and not failures:
+            del self._failures[key]
+            return None
+        return failures
+
+    def retry_after(self, key):
+        # Seconds until `key` may try again, or 0 if it isn't locked out
+        now = time.monotonic()
+        with self._lock:
+            failures = self._recent(key, now)
+            if failures is None or len(failures) < self.max_failures:
+                return 0
+            return failures[0] + self.window - now
+
+    def record_failure(self, key):
+        with self._lock:
+            self._failures.setdefault(key, deque()).append(time.monotonic())
+
+    def reset(self, key):
+        with self._lock:
+            self._failures.pop(key, None)
+
+
+# --- Session Tokens (validated with one dict lookup per rerun) ---
+class SessionTokens:
+    def __init__(self, ttl=SESSION_TTL_SECONDS):
+        self.ttl = ttl
+        self._tokens = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._tokens)
+
+    def issue(self, email):
+        token = secrets.token_urlsafe(32)
+        now = time.monotonic()
+        with self._lock:
+            self._sweep(now)
+            self._tokens[token] = (normalize_email(email), now + self.ttl)
+        return token
+
+    def _sweep(self, now):
+        # One TTL for every token, so insertion order is expiry order: abandoned
+        # sessions are dropped from the front without scanning the live ones
+        while self._tokens:
+            token = next(iter(self._tokens))
+            if self._tokens[token][1] >= now:
+                break
+            del self._tokens[token]
+
+    def user(self, token):
+        entry = self._tokens.get(token) if token else None
+        if entry is None:
+            return None
+        if entry[1] < time.monotonic():
+            self.revoke(token)
+            return None
+        return entry[0]
+
+    def revoke(self, token):
+        with self._lock:
+            self._tokens.pop(token, None)
+
+
+# --- Command Line: hash a password for the users CSV ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Print an email,password_hash line for the USER_STORE_PATH CSV.")
+    parser.add_argument('email')
+    parser.add_argument('--iterations', type=int, default=PASSWORD_ITERATIONS)
+    args = parser.parse_args(argv)
+    password = getpass.getpass("Password: ")
+    if password != getpass.getpass("Repeat password: "):
+        print("Passwords do not match", file=sys.stderr)
+        sys.exit(1)
+    print(f"{normalize_email(args.email)},{hash_password(password, iterations=args.iterations)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+import random
+import sys
+from itertools import combinations
+from core.closure import ClassClosure
+from core.compiled import build_compiled
+from core.facts import content_version, load_facts, load_memberships
+from core.index import build_index, index_backend
+from core.knowledge_base import build_knowledge_base
+
+# --- Backend Registry ---
+BACKENDS = {
+    'datalog': build_knowledge_base,
+    'index': build_index,
+    'compiled': build_compiled,
+}
+DEFAULT_BACKEND = 'compiled'
+
+
+def build_backend(name=DEFAULT_BACKEND, facts=None, memberships=None):
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown interaction backend '{name}'. Choose from: {', '.join(sorted(BACKENDS))}")
+    return BACKENDS[name](facts, memberships)
+
+
+# --- Parity Check ---
+def canonical(results):
+    # Backends may list the hits of one pair in a different order
+    return sorted(tuple(r.values()) for r in results)
+
+
+def compare_backends(reference, candidate, drug_lists):
+    mismatches = []
+    for drug_list in drug_lists:
+        expected = canonical(reference.check_all_interactions(drug_list))
+        actual = canonical(candidate.check_all_interactions(drug_list))
+        if expected != actual:
+            mismatches.append((drug_list, expected, actual))
+    return mismatches
+
+
+def parity_drug_lists(facts=None, memberships=None, samples=200, seed=0):
+    facts = load_facts() if facts is None else facts
+    memberships = load_memberships() if memberships is None else memberships
+    drugs = sorted({d for fact in facts for d in fact[:2]} | {d for d, _ in memberships})
+    drug_lists = [list(pair) for pair in combinations(drugs, 2)]
+    rng = random.Random(seed)
+    # Small (e.g. synthetic) KBs may have fewer than 40 drugs to draw from
+    largest = min(40, len(drugs))
+    for _ in range(samples if largest >= 3 else 0):
+        drug_lists.append(rng.sample(drugs, rng.randint(3, largest)))
+    return drug_lists
+
+
+# --- Incremental Check: closure updates + with_changes against a full rebuild ---
+def index_table(backend):
+    return sorted((d1, d2, tuple(sorted(outcomes))) for d1, d2, outcomes in backend.pairs())
+
+
+def random_edit(rng, facts, memberships, drugs=20, classes=6):
+    nodes = [f'drug{i}' for i in range(drugs)] + [f'class{i}' for i in range(classes)]
+    action = rng.random()
+    if action < 0.35:
+        d1, d2 = rng.sample(nodes, 2)
+        # Few distinct outcomes, so duplicate and conflicting facts both occur
+        facts.append((d1, d2, rng.choice(['high', 'moderate', 'low']), f'risk{rng.randint(0, 2)}', 'review'))
+    elif action < 0.6 and facts:
+        facts.pop(rng.randrange(len(facts)))
+    elif action < 0.85:
+        # Classes only point at higher-numbered classes, so the hierarchy stays acyclic
+        c = rng.randrange(classes)
+        child = rng.choice([f'drug{rng.randrange(drugs)}'] + [f'class{i}' for i in range(c)])
+        memberships.append((child, f'class{c}'))
+    elif memberships:
+        memberships.pop(rng.randrange(len(memberships)))
+
+
+def compare_incremental(steps=300, seed=0):
+    rng = random.Random(seed)
+    facts, memberships = [], []
+    for _ in range(30):
+        random_edit(rng, facts, memberships)
+    closure = ClassClosure(facts, memberships)
+    backend = index_backend(closure.facts(), content_version(facts, memberships), 0)
+    mismatches = []
+    for step in range(steps):
+        for _ in range(rng.randint(1, 3)):
+            random_edit(rng, facts, memberships)
+        backend = backend.with_changes(closure.update(facts, memberships), content_version(facts, memberships))
+        full = build_index(facts, memberships)
+        if index_table(backend) != index_table(full) or backend.version != full.version:
+            mismatches.append((step, list(facts), list(memberships)))
+    return mismatches
+
+
+if __name__ == '__main__':
+    reference = build_backend('datalog')
+    drug_lists = parity_drug_lists()
+    failed = False
+    for name in sorted(BACKENDS):
+        if name == reference.name:
+            continue
+        mismatches = compare_backends(reference, build_backend(name), drug_lists)
+        for drug_list, expected, actual in mismatches[:10]:
+            print(f"MISMATCH {drug_list}\n  datalog: {expected}\n  {name}: {actual}")
+        print(f"{name}: {len(drug_lists) - len(mismatches)}/{len(drug_lists)} drug lists identical to datalog")
+        failed = failed or bool(mismatches)
+    steps = 300
+    mismatches = compare_incremental(steps)
+    for step, facts, memberships in mismatches[:3]:
+        print(f"MISMATCH after step {step}\n  facts: {facts}\n  memberships: {memberships}")
+    print(f"incremental index: {steps - len(mismatches)}/{steps} updates identical to a full rebuild")
+    failed = failed or bool(mismatches)
+    sys.exit(1 if failed else 0)
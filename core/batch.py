@@ -0,0 +1,193 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from core.backends import BACKENDS, DEFAULT_BACKEND, build_backend
+from core.results import EXPORT_CHUNK_ROWS, RESULT_FIELDS, ResultTable, write_parquet
+from core.vocabulary import build_vocabulary
+
+
+# --- Input Readers (streamed, one patient at a time) ---
+def read_patients_csv(path, id_column='patient_id', drugs_column='drugs', separator=';'):
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            yield row[id_column], row[drugs_column].split(separator)
+
+
+def read_patients_jsonl(path, id_column='patient_id', drugs_column='drugs'):
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record[id_column], record[drugs_column]
+
+
+def read_patients(path, fmt=None, **options):
+    fmt = fmt or _format_from_path(path)
+    if fmt == 'csv':
+        return read_patients_csv(path, **options)
+    options.pop('separator', None)
+    return read_patients_jsonl(path, **options)
+
+
+# --- Output Writers (flushed per chunk) ---
+class CsvResultWriter:
+    def __init__(self, f):
+        self._writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        self._writer.writeheader()
+
+    def write(self, patient_id, interactions):
+        for interaction in interactions:
+            self._writer.writerow({'patient_id': patient_id, **interaction})
+
+    def close(self):
+        pass
+
+
+class JsonlResultWriter:
+    def __init__(self, f):
+        self._f = f
+
+    def write(self, patient_id, interactions):
+        self._f.write(json.dumps({'patient_id': patient_id, 'interactions': interactions}) + '\n')
+
+    def close(self):
+        pass
+
+
+class ParquetResultWriter:
+    # Rows collect in a columnar table and go out as one row group per chunk
+    def __init__(self, f, chunk_rows=EXPORT_CHUNK_ROWS):
+        self._f = f
+        self._chunk_rows = chunk_rows
+        self._table = ResultTable()
+        self._writer = None
+
+    def write(self, patient_id, interactions):
+        self._table.append(patient_id, interactions)
+        if len(self._table) >= self._chunk_rows:
+            self._flush()
+
+    def _flush(self):
+        import pyarrow.parquet as pq
+
+        for batch in self._table.arrow_batches(self._chunk_rows, with_patient=True):
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self._f, batch.schema)
+            self._writer.write_batch(batch)
+        self._table = ResultTable()
+
+    def close(self):
+        self._flush()
+        if self._writer is None:
+            write_parquet(self._table, self._f, with_patient=True)
+        else:
+            self._writer.close()
+
+
+WRITERS = {'csv': CsvResultWriter, 'jsonl': JsonlResultWriter, 'parquet': ParquetResultWriter}
+
+
+def _format_from_path(path):
+    suffix = str(path).lower().rsplit('.', 1)[-1]
+    return suffix if suffix in ('csv', 'parquet') else 'jsonl'
+
+
+# --- Worker Process ---
+_worker_backend = None
+_worker_vocabulary = None
+
+
+def _init_worker(backend_name):
+    global _worker_backend, _worker_vocabulary
+    _worker_backend = build_backend(backend_name)
+    _worker_vocabulary = build_vocabulary(_worker_backend)
+
+
+def _screen_chunk(chunk):
+    # Brand names and spelling variants resolve to the generic drug first
+    return [
+        (patient_id, _worker_backend.check_all_interactions(_worker_vocabulary.resolve_all(drugs)))
+        for patient_id, drugs in chunk
+    ]
+
+
+def _chunked(records, chunk_size):
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# --- Batch Screening API ---
+def screen_patients(records, backend=DEFAULT_BACKEND, workers=None, chunk_size=500):
+    """Yield (patient_id, interactions) for each record, in input order.
+
+    At most two chunks per worker are in flight, so memory stays bounded
+    however long the input stream is.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(backend)
+        for chunk in _chunked(records, chunk_size):
+            yield from _screen_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(backend,)) as pool:
+        pending = deque()
+        for chunk in _chunked(records, chunk_size):
+            pending.append(pool.submit(_screen_chunk, chunk))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def screen_file(input_path, output_path, input_format=None, output_format=None, backend=DEFAULT_BACKEND,
+                workers=None, chunk_size=500, **read_options):
+    output_format = output_format or _format_from_path(output_path)
+    records = read_patients(input_path, input_format, **read_options)
+    patients = hits = 0
+    binary = output_format == 'parquet'
+    with open(output_path, 'wb' if binary else 'w', **({} if binary else {'newline': '', 'encoding': 'utf-8'})) as f:
+        writer = WRITERS[output_format](f)
+        for patient_id, interactions in screen_patients(records, backend, workers, chunk_size):
+            writer.write(patient_id, interactions)
+            patients += 1
+            hits += len(interactions)
+            if patients % chunk_size == 0 and not binary:
+                f.flush()
+        writer.close()
+    return patients, hits
+
+
+# --- Command Line ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screen patient medication lists for drug interactions.")
+    parser.add_argument('input', help="CSV or JSONL file with one patient medication list per row")
+    parser.add_argument('-o', '--output', required=True, help="CSV, JSONL or Parquet file to write results to")
+    parser.add_argument('--input-format', choices=['csv', 'jsonl'])
+    parser.add_argument('--output-format', choices=sorted(WRITERS))
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=DEFAULT_BACKEND)
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=500, help="patients per worker task")
+    parser.add_argument('--id-column', default='patient_id')
+    parser.add_argument('--drugs-column', default='drugs')
+    parser.add_argument('--separator', default=';', help="drug separator inside a CSV drugs cell")
+    args = parser.parse_args(argv)
+
+    patients, hits = screen_file(
+        args.input, args.output, args.input_format, args.output_format, args.backend, args.workers,
+        args.chunk_size, id_column=args.id_column, drugs_column=args.drugs_column, separator=args.separator
+    )
+    print(f"Screened {patients} patient(s), {hits} interaction(s) written to {args.output}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+import threading
+from collections import OrderedDict
+from core.knowledge_base import normalize_drug_list
+
+
+def canonical_drug_set(drug_list):
+    # Order and repeats don't change which pairs interact
+    return tuple(sorted(set(normalize_drug_list(drug_list))))
+
+
+# --- Process-wide LRU Cache of Interaction Results ---
+class ResultCache:
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _sync_version(self, backend):
+        # A reloaded knowledge base makes every cached answer suspect
+        if (backend.name, backend.version) != self._version:
+            self._entries.clear()
+            self._version = (backend.name, backend.version)
+
+    def check_all_interactions(self, backend, drug_list):
+        drugs = canonical_drug_set(drug_list)
+        with self._lock:
+            self._sync_version(backend)
+            results = self._entries.get(drugs)
+            if results is not None:
+                self._entries.move_to_end(drugs)
+                self.hits += 1
+                return list(results)
+            self.misses += 1
+
+        results = backend.check_all_interactions(list(drugs))
+
+        with self._lock:
+            if (backend.name, backend.version) == self._version:
+                self._entries[drugs] = results
+                self._entries.move_to_end(drugs)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return list(results)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'version': self._version[1] if self._version else None,
+            }
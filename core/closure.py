@@ -0,0 +1,175 @@
+from collections import Counter
+from core.facts import load_facts, load_memberships, pair_key
+
+
+# --- Class Hierarchy (is_a edges, walked transitively) ---
+class ClassHierarchy:
+    def __init__(self, memberships=()):
+        self.parents = {}
+        self.children = {}
+        for drug, cls in memberships:
+            self.add(drug, cls)
+
+    def add(self, drug, cls):
+        self.parents.setdefault(drug, set()).add(cls)
+        self.children.setdefault(cls, set()).add(drug)
+
+    def remove(self, drug, cls):
+        for edges, node, other in ((self.parents, drug, cls), (self.children, cls, drug)):
+            nodes = edges.get(node)
+            if nodes is not None:
+                nodes.discard(other)
+                if not nodes:
+                    del edges[node]
+
+    def memberships(self):
+        return {(drug, cls) for drug, classes in self.parents.items() for cls in classes}
+
+    def is_class(self, node):
+        return node in self.children
+
+    @staticmethod
+    def _walk(node, edges):
+        seen = {node}
+        stack = [node]
+        while stack:
+            for nxt in edges.get(stack.pop(), ()):
+                if nxt not in seen:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return seen
+
+    def ancestors(self, node):
+        # Includes `node` itself
+        return self._walk(node, self.parents)
+
+    def descendants(self, node):
+        return self._walk(node, self.children)
+
+
+# --- Class Inheritance Closure ---
+class ClassClosure:
+    """Materialized interaction table with class inheritance.
+
+    A drug inherits every interaction of the classes it belongs to
+    (transitively), on either side of the pair. Facts stated directly for a
+    pair take precedence over inherited ones.
+    """
+
+    def __init__(self, facts, memberships=()):
+        self._direct = {}
+        self._pairs_by_node = {}
+        for fact in facts:
+            self._add_direct(fact)
+        self._classes = ClassHierarchy(memberships)
+        self._table = {}
+        for a, b in list(self._direct):
+            self._recompute(self._expand(a, b))
+
+    def _add_direct(self, fact):
+        pair = pair_key(fact[0], fact[1])
+        self._direct.setdefault(pair, []).append(fact)
+        for node in pair:
+            self._pairs_by_node.setdefault(node, set()).add(pair)
+
+    def ancestors(self, node):
+        return self._classes.ancestors(node)
+
+    def descendants(self, node):
+        return self._classes.descendants(node)
+
+    def _expand(self, a, b):
+        return {pair_key(d1, d2) for d1 in self.descendants(a) for d2 in self.descendants(b)}
+
+    # --- Derivation ---
+    def _derive(self, d1, d2):
+        direct = self._direct.get((d1, d2))
+        if direct:
+            return list(direct)
+        derived = []
+        up1, up2 = self.ancestors(d1), self.ancestors(d2)
+        for a in up1:
+            for b in up2:
+                for fact in self._direct.get(pair_key(a, b), ()):
+                    # Keep the fact's orientation: the drug takes its class's side
+                    first = d1 if fact[0] == a and fact[1] == b else d2
+                    second = d2 if first == d1 else d1
+                    derived.append((first, second) + tuple(fact[2:]))
+        return derived
+
+    def _recompute(self, pairs):
+        for pair in pairs:
+            facts = self._derive(*pair)
+            if facts:
+                self._table[pair] = facts
+            else:
+                self._table.pop(pair, None)
+        return {pair: list(self._table.get(pair, ())) for pair in pairs}
+
+    def facts(self):
+        return [fact for pair in sorted(self._table) for fact in self._table[pair]]
+
+    # --- Incremental Updates (each returns {pair: facts} for changed pairs) ---
+    def add_fact(self, fact):
+        self._add_direct(fact)
+        return self._recompute(self._expand(fact[0], fact[1]))
+
+    def remove_fact(self, fact):
+        pair = pair_key(fact[0], fact[1])
+        facts = self._direct.get(pair, [])
+        if fact in facts:
+            facts.remove(fact)
+        if not facts:
+            self._direct.pop(pair, None)
+            for node in pair:
+                self._pairs_by_node.get(node, set()).discard(pair)
+        return self._recompute(self._expand(fact[0], fact[1]))
+
+    def _membership_pairs(self, drug, cls):
+        pairs = set()
+        members = self.descendants(drug)
+        for a in self.ancestors(cls):
+            for b1, b2 in self._pairs_by_node.get(a, ()):
+                other = b2 if a == b1 else b1
+                pairs |= {pair_key(d, e) for d in members for e in self.descendants(other)}
+        return pairs
+
+    def add_membership(self, drug, cls):
+        self._classes.add(drug, cls)
+        return self._recompute(self._membership_pairs(drug, cls))
+
+    def remove_membership(self, drug, cls):
+        pairs = self._membership_pairs(drug, cls)
+        self._classes.remove(drug, cls)
+        return self._recompute(pairs)
+
+    def diff(self, facts, memberships):
+        """Facts and memberships to remove and add to reach `facts` and `memberships`."""
+        current = Counter(fact for pair_facts in self._direct.values() for fact in pair_facts)
+        wanted = Counter(facts)
+        members = self._classes.memberships()
+        wanted_members = set(memberships)
+        return (list((current - wanted).elements()), sorted(members - wanted_members),
+                sorted(wanted_members - members), list((wanted - current).elements()))
+
+    def apply(self, diff):
+        removed_facts, removed_members, added_members, added_facts = diff
+        changed = {}
+        # Each step reports every pair it touched, so later steps overwrite earlier ones
+        for fact in removed_facts:
+            changed.update(self.remove_fact(fact))
+        for drug, cls in removed_members:
+            changed.update(self.remove_membership(drug, cls))
+        for drug, cls in added_members:
+            changed.update(self.add_membership(drug, cls))
+        for fact in added_facts:
+            changed.update(self.add_fact(fact))
+        return changed
+
+    def update(self, facts, memberships):
+        return self.apply(self.diff(facts, memberships))
+
+def materialize(facts=None, memberships=None):
+    facts = load_facts() if facts is None else facts
+    memberships = load_memberships() if memberships is None else memberships
+    return ClassClosure(facts, memberships).facts()
@@ -0,0 +1,254 @@
+import argparse
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from core.closure import materialize
+from core.facts import CLASSES_PATH, DATA_DIR, SOURCE_PATH, load_facts, load_memberships
+from core.index import IndexBackend, group_facts
+
+ARTIFACT_PATH = os.path.join(DATA_DIR, 'interactions.kb')
+
+# --- Artifact Layout ---
+# Header, then little-endian uint32 sections:
+#   string_offsets[n_strings + 1]   offsets into the UTF-8 blob
+#   facts[n_facts * 5]              drug 1, drug 2, severity, risk, recommendation (string ids)
+#   adj_offsets[n_drugs + 1]        per-drug slice of the adjacency arrays (CSR)
+#   adj_neighbour[n_adj]            neighbour drug id, sorted within each drug
+#   adj_first[n_adj]                first fact row of that pair
+#   adj_count[n_adj]                number of fact rows of that pair
+# and finally the string blob. Drug ids are the first n_drugs string ids,
+# sorted by name, so a drug name is found by binary search.
+MAGIC = b'DIKB'
+# Bump whenever the compiler's output for the same source changes
+FORMAT_VERSION = 3
+HEADER = struct.Struct('<4sIQq32sIIIII')
+
+
+# --- Source Fingerprint (interaction facts plus class membership) ---
+def source_fingerprint(source=SOURCE_PATH, classes=CLASSES_PATH):
+    digest = hashlib.sha256()
+    for path in (source, classes):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    size, mtime_ns = _source_stat(source, classes)
+    return size, mtime_ns, digest.digest()
+
+
+def _source_stat(source=SOURCE_PATH, classes=CLASSES_PATH):
+    stats = [os.stat(source), os.stat(classes)]
+    return sum(stat.st_size for stat in stats), max(stat.st_mtime_ns for stat in stats)
+
+
+# --- Compiler (expects facts with class inheritance already materialized) ---
+def compile_facts(facts, fingerprint=None):
+    if fingerprint is None:
+        # In-memory compile: no source file, so version by content
+        fingerprint = (0, 0, hashlib.sha256(repr(facts).encode('utf-8')).digest())
+    grouped = group_facts(facts)
+    drugs = sorted({drug for pair in grouped for drug in pair})
+    strings = list(drugs)
+    string_ids = {s: i for i, s in enumerate(strings)}
+
+    def intern(s):
+        if s not in string_ids:
+            string_ids[s] = len(strings)
+            strings.append(s)
+        return string_ids[s]
+
+    fact_rows = array('I')
+    pair_rows = {}
+    for d1, d2 in sorted(grouped):
+        pair_rows[(d1, d2)] = (len(fact_rows) // 5, len(grouped[(d1, d2)]))
+        for severity, risk, recommendation in grouped[(d1, d2)]:
+            fact_rows.extend([string_ids[d1], string_ids[d2], intern(severity), intern(risk), intern(recommendation)])
+
+    neighbours = [[] for _ in drugs]
+    for (d1, d2), (first, count) in pair_rows.items():
+        neighbours[string_ids[d1]].append((string_ids[d2], first, count))
+        if d1 != d2:
+            neighbours[string_ids[d2]].append((string_ids[d1], first, count))
+    adj_offsets, adj_neighbour, adj_first, adj_count = array('I', [0]), array('I'), array('I'), array('I')
+    for entries in neighbours:
+        for neighbour, first, count in sorted(entries):
+            adj_neighbour.append(neighbour)
+            adj_first.append(first)
+            adj_count.append(count)
+        adj_offsets.append(len(adj_neighbour))
+
+    blob = bytearray()
+    string_offsets = array('I', [0])
+    for s in strings:
+        blob += s.encode('utf-8')
+        string_offsets.append(len(blob))
+
+    size, mtime_ns, digest = fingerprint
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, size, mtime_ns, digest,
+                         len(strings), len(drugs), len(fact_rows) // 5, len(adj_neighbour), len(blob))
+    sections = [string_offsets, fact_rows, adj_offsets, adj_neighbour, adj_first, adj_count]
+    if sys.byteorder != 'little':
+        for section in sections:
+            section.byteswap()
+    return header + b''.join(section.tobytes() for section in sections) + bytes(blob)
+
+
+def compile_source(source=SOURCE_PATH, output=ARTIFACT_PATH, classes=CLASSES_PATH):
+    facts = materialize(load_facts(source), load_memberships(classes))
+    data = compile_facts(facts, source_fingerprint(source, classes))
+    tmp_path = f"{output}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, output)
+    return len(data)
+
+
+# --- Memory-mapped Backend ---
+class CompiledBackend(IndexBackend):
+    name = 'compiled'
+
+    def __init__(self, buffer, build_seconds):
+        view = memoryview(buffer)
+        (magic, version, self.source_size, self.source_mtime_ns, self.source_sha256,
+         n_strings, self.drug_count, self.fact_count, n_adj, blob_len) = HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"Not a version {FORMAT_VERSION} knowledge-base artifact")
+        offset = HEADER.size
+
+        def take(count):
+            nonlocal offset
+            section = view[offset:offset + 4 * count]
+            offset += 4 * count
+            if sys.byteorder != 'little':
+                section = array('I', section.tobytes())
+                section.byteswap()
+                return section
+            return section.cast('I')
+
+        self._string_offsets = take(n_strings + 1)
+        self._facts = take(self.fact_count * 5)
+        self._adj_offsets = take(self.drug_count + 1)
+        self._adj_neighbour = take(n_adj)
+        self._adj_first = take(n_adj)
+        self._adj_count = take(n_adj)
+        self._blob = view[offset:offset + blob_len]
+        self._buffer = buffer
+        self.version = self.source_sha256.hex()[:12]
+        self._strings = {}
+        self.build_seconds = build_seconds
+
+    def _string(self, string_id):
+        s = self._strings.get(string_id)
+        if s is None:
+            start, end = self._string_offsets[string_id], self._string_offsets[string_id + 1]
+            s = self._strings[string_id] = bytes(self._blob[start:end]).decode('utf-8')
+        return s
+
+    def _key(self, drug):
+        drug_id = bisect_left(range(self.drug_count), drug, key=self._string)
+        if drug_id < self.drug_count and self._string(drug_id) == drug:
+            return drug_id
+        return None
+
+    def _neighbours(self, key):
+        return self._adj_neighbour[self._adj_offsets[key]:self._adj_offsets[key + 1]]
+
+    def _hits(self, k1, k2):
+        lo, hi = self._adj_offsets[k1], self._adj_offsets[k1 + 1]
+        entry = bisect_left(self._adj_neighbour, k2, lo, hi)
+        if entry == hi or self._adj_neighbour[entry] != k2:
+            return ()
+        first = self._adj_first[entry]
+        return [self._fact_outcome(row) for row in range(first, first + self._adj_count[entry])]
+
+    def _fact_outcome(self, row):
+        facts = self._facts
+        return self._string(facts[5 * row + 2]), self._string(facts[5 * row + 3]), self._string(facts[5 * row + 4])
+
+    def drugs(self):
+        return [self._string(i) for i in range(self.drug_count)]
+
+    def pairs(self):
+        for drug_id in range(self.drug_count):
+            lo, hi = self._adj_offsets[drug_id], self._adj_offsets[drug_id + 1]
+            for entry in range(bisect_left(self._adj_neighbour, drug_id, lo, hi), hi):
+                first = self._adj_first[entry]
+                outcomes = [self._fact_outcome(row) for row in range(first, first + self._adj_count[entry])]
+                yield self._string(drug_id), self._string(self._adj_neighbour[entry]), outcomes
+
+    def facts(self):
+        facts = self._facts
+        return [(self._string(facts[5 * row]), self._string(facts[5 * row + 1])) + self._fact_outcome(row)
+                for row in range(self.fact_count)]
+
+    def is_stale(self, source=SOURCE_PATH, classes=CLASSES_PATH):
+        return _source_stat(source, classes) != (self.source_size, self.source_mtime_ns)
+
+
+def load_compiled(path=ARTIFACT_PATH):
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return CompiledBackend(buffer, time.perf_counter() - start)
+
+
+def build_compiled(facts=None, memberships=None):
+    if facts is not None or memberships is not None:
+        start = time.perf_counter()
+        return CompiledBackend(compile_facts(materialize(facts, memberships)), time.perf_counter() - start)
+    start = time.perf_counter()
+    try:
+        backend = load_compiled()
+        if not backend.is_stale():
+            return backend
+    except (OSError, ValueError):
+        # Missing artifact or one written by an older compiler
+        pass
+    try:
+        compile_source()
+    except OSError:
+        # Read-only deployment: fall back to an in-memory compile
+        return CompiledBackend(compile_facts(materialize(), source_fingerprint()), time.perf_counter() - start)
+    return load_compiled()
+
+
+# --- Artifact Check ---
+def check_artifact(source=SOURCE_PATH, artifact=ARTIFACT_PATH, classes=CLASSES_PATH):
+    problems = []
+    backend = load_compiled(artifact)
+    if backend.source_sha256 != source_fingerprint(source, classes)[2]:
+        problems.append(f"{artifact} was compiled from a different version of {source} or {classes}")
+    facts = materialize(load_facts(source), load_memberships(classes))
+    expected = sorted((d1, d2) + outcome for (d1, d2), outcomes in group_facts(facts).items()
+                      for outcome in outcomes)
+    if sorted(backend.facts()) != expected:
+        problems.append(f"{artifact} facts do not match {source}")
+    return problems
+
+
+# --- Command Line ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or verify the compiled knowledge-base artifact.")
+    parser.add_argument('command', choices=['build', 'check'])
+    parser.add_argument('--source', default=SOURCE_PATH, help="interaction facts CSV")
+    parser.add_argument('--classes', default=CLASSES_PATH, help="drug class membership CSV")
+    parser.add_argument('--artifact', default=ARTIFACT_PATH, help="compiled artifact path")
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        size = compile_source(args.source, args.artifact, args.classes)
+        print(f"Wrote {args.artifact} ({size} bytes)")
+        return
+    problems = check_artifact(args.source, args.artifact, args.classes)
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    if problems:
+        sys.exit(1)
+    print(f"{args.artifact} matches {args.source}")
+
+
+if __name__ == '__main__':
+    main()
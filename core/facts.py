@@ -0,0 +1,68 @@
+import csv
+import hashlib
+import os
+
+DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data'))
+SOURCE_PATH = os.path.join(DATA_DIR, 'interactions.csv')
+SYNONYMS_PATH = os.path.join(DATA_DIR, 'synonyms.csv')
+CLASSES_PATH = os.path.join(DATA_DIR, 'drug_classes.csv')
+ATTRIBUTES_PATH = os.path.join(DATA_DIR, 'drug_attributes.csv')
+SET_RULES_PATH = os.path.join(DATA_DIR, 'set_rules.csv')
+
+# Column order of the source file and of every fact tuple
+FIELDS = ['drug_1', 'drug_2', 'severity', 'risk', 'recommendation']
+
+
+# --- Drug Name Normalization (shared by facts, queries and the vocabulary) ---
+def normalize_drug(name):
+    return name.strip().lower()
+
+
+# --- Order-insensitive Pair Key (shared by the closure, the index and regimens) ---
+def pair_key(d1, d2):
+    return (d1, d2) if d1 <= d2 else (d2, d1)
+
+
+# --- Knowledge-base Version: content hash, so a reload of unchanged data keeps it ---
+def content_version(*parts):
+    return hashlib.sha256(repr(parts).encode('utf-8')).hexdigest()[:12]
+
+
+# --- Interaction Facts: (drug 1, drug 2, severity, risk, recommendation) ---
+def load_facts(path=SOURCE_PATH):
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        missing = set(FIELDS) - set(reader.fieldnames or [])
+        if missing:
+            raise ValueError(f"{path} is missing column(s): {', '.join(sorted(missing))}")
+        return [
+            (normalize_drug(row['drug_1']), normalize_drug(row['drug_2']), row['severity'], row['risk'], row['recommendation'])
+            for row in reader
+        ]
+
+
+# --- Brand / Alternate Names: synonym -> generic drug ---
+def load_synonyms(path=SYNONYMS_PATH):
+    with open(path, newline='', encoding='utf-8') as f:
+        return {normalize_drug(row['synonym']): normalize_drug(row['drug']) for row in csv.DictReader(f)}
+
+
+# --- Class Membership: (drug, class) meaning is_a(drug, class) ---
+def load_memberships(path=CLASSES_PATH):
+    with open(path, newline='', encoding='utf-8') as f:
+        return [(normalize_drug(row['drug']), normalize_drug(row['class'])) for row in csv.DictReader(f)]
+
+
+# --- Drug Attributes: (drug or class, attribute), e.g. (tramadol, serotonergic) ---
+def load_attributes(path=ATTRIBUTES_PATH):
+    with open(path, newline='', encoding='utf-8') as f:
+        return [(normalize_drug(row['drug']), normalize_drug(row['attribute'])) for row in csv.DictReader(f)]
+
+
+# --- Multi-drug Rules: (rule, requires, severity, risk, recommendation) ---
+# `requires` is "+"-joined terms like "2*serotonergic + tramadol": at least
+# that many distinct drugs with the attribute (a drug name is its own attribute)
+def load_set_rules(path=SET_RULES_PATH):
+    with open(path, newline='', encoding='utf-8') as f:
+        return [(row['rule'], row['requires'], row['severity'], row['risk'], row['recommendation'])
+                for row in csv.DictReader(f)]
@@ -0,0 +1,99 @@
+import json
+import os
+from functools import lru_cache
+
+# Served as a Streamlit component: lib/index.html loads the bundled vis-9.1.2 assets
+VIS_COMPONENT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'lib'))
+
+SEVERITY_COLORS = {'high': 'red', 'moderate': 'orange', 'low': 'green'}
+
+# Same physics the page used through pyvis' barnes_hut()
+BARNES_HUT_OPTIONS = {
+    'edges': {'color': {'inherit': True}, 'smooth': {'enabled': True, 'type': 'dynamic'}},
+    'interaction': {'dragNodes': True, 'hideEdgesOnDrag': False, 'hideNodesOnDrag': False},
+    'physics': {
+        'enabled': True,
+        'solver': 'barnesHut',
+        'barnesHut': {
+            'gravitationalConstant': -80000,
+            'centralGravity': 0.3,
+            'springLength': 250,
+            'springConstant': 0.001,
+            'damping': 0.09,
+            'avoidOverlap': 0,
+        },
+        'stabilization': {'enabled': True, 'fit': True, 'iterations': 1000, 'updateInterval': 50},
+    },
+}
+
+
+# --- Graph Data ---
+def graph_key(interactions):
+    return tuple((i['Drug 1'], i['Drug 2'], i['Severity'], i['Risk']) for i in interactions)
+
+
+def graph_data(key):
+    nodes, edges = {}, []
+    for n, (d1, d2, severity, risk) in enumerate(key):
+        for drug in (d1, d2):
+            nodes.setdefault(drug, {'id': drug, 'label': drug, 'shape': 'dot', 'color': '#97c2fc', 'font': {'color': 'black'}})
+        edges.append({
+            'id': n,
+            'from': d1,
+            'to': d2,
+            'color': SEVERITY_COLORS.get(severity.lower(), 'gray'),
+            'title': f"{severity.title()}\n{risk}",
+        })
+    return list(nodes.values()), edges
+
+
+# --- Graph JSON (only data goes to the browser; cached by result set) ---
+def graph_json(nodes, edges, options):
+    return json.dumps({'nodes': nodes, 'edges': edges, 'options': options})
+
+
+@lru_cache(maxsize=256)
+def _render(key, options_json):
+    nodes, edges = graph_data(key)
+    return graph_json(nodes, edges, json.loads(options_json))
+
+
+def render_graph_json(interactions, options=None):
+    options_json = json.dumps(BARNES_HUT_OPTIONS if options is None else options, sort_keys=True)
+    return _render(graph_key(interactions), options_json)
+
+
+# --- Whole-knowledge-base Network (positions precomputed server-side) ---
+STATIC_LAYOUT_OPTIONS = {
+    'physics': {'enabled': False},
+    'layout': {'improvedLayout': False},
+    'edges': {'smooth': False, 'width': 1},
+    'nodes': {'shape': 'dot', 'scaling': {'min': 6, 'max': 40}, 'font': {'color': 'black'}},
+    'interaction': {'hover': True, 'hideEdgesOnDrag': True, 'tooltipDelay': 100},
+}
+
+
+def render_network_json(nodes, edges, positions, degrees):
+    node_data = [
+        {
+            'id': i,
+            'label': drug.title(),
+            'x': float(positions[i][0]),
+            'y': float(positions[i][1]),
+            'value': degrees[i],
+            'color': '#97c2fc',
+            'title': f"{drug.title()}\n{degrees[i]} interaction(s)",
+        }
+        for i, drug in enumerate(nodes)
+    ]
+    edge_data = [
+        {
+            'id': n,
+            'from': i,
+            'to': j,
+            'color': SEVERITY_COLORS.get(worst.lower(), 'gray'),
+            'title': "\n".join(f"{severity.title()}: {risk}" for severity, risk, _ in outcomes),
+        }
+        for n, (i, j, worst, outcomes) in enumerate(edges)
+    ]
+    return graph_json(node_data, edge_data, STATIC_LAYOUT_OPTIONS)
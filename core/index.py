@@ -0,0 +1,174 @@
+import time
+from itertools import combinations
+from core.closure import materialize
+from core.facts import content_version, load_facts, load_memberships, pair_key
+from core.knowledge_base import InteractionBackend, make_result, normalize_drug_list
+
+# Drug lists at least this long are screened through the adjacency lists
+# (see benchmarks/screening.py for the crossover measurement)
+SCREEN_THRESHOLD = 16
+
+
+# --- Hash-indexed Backend ---
+class IndexBackend(InteractionBackend):
+    name = 'index'
+
+    def __init__(self, index, adjacency, fact_count, version, build_seconds):
+        self._index = index
+        self._adjacency = adjacency
+        self.fact_count = fact_count
+        self.version = version
+        self.build_seconds = build_seconds
+
+    # Lookup hooks: subclasses may key drugs by something other than name
+    def _key(self, drug):
+        return drug
+
+    def _hits(self, k1, k2):
+        return self._index.get(pair_key(k1, k2), ())
+
+    def _neighbours(self, key):
+        return self._adjacency.get(key, ())
+
+    def check_interaction(self, d1, d2):
+        k1, k2 = self._key(d1), self._key(d2)
+        if k1 is None or k2 is None:
+            return []
+        return list(self._hits(k1, k2))
+
+    def drugs(self):
+        return sorted(self._adjacency)
+
+    def pairs(self):
+        for (d1, d2), outcomes in self._index.items():
+            yield d1, d2, list(outcomes)
+
+    def with_changes(self, changed, version):
+        """Copy of this backend with {pair: facts} from ClassClosure updates applied.
+
+        `version` is the content version of the updated sources, so it matches a
+        full build of the same data.
+        """
+        start = time.perf_counter()
+        index = dict(self._index)
+        adjacency = dict(self._adjacency)
+        for (d1, d2), facts in changed.items():
+            entries = group_facts(facts).get(pair_key(d1, d2))
+            if entries:
+                index[pair_key(d1, d2)] = entries
+            else:
+                index.pop(pair_key(d1, d2), None)
+            for drug, other in ((d1, d2), (d2, d1)):
+                partners = set(adjacency.get(drug, ()))
+                if entries:
+                    partners.add(other)
+                else:
+                    partners.discard(other)
+                if partners:
+                    adjacency[drug] = frozenset(partners)
+                else:
+                    adjacency.pop(drug, None)
+        fact_count = sum(len(entries) for entries in index.values())
+        return IndexBackend(index, adjacency, fact_count, version, time.perf_counter() - start)
+
+    def interaction_partners(self, drug, others):
+        key = self._key(drug)
+        if key is None:
+            return {}
+        by_key = {}
+        for other in others:
+            other_key = self._key(other)
+            if other_key is not None and other != drug:
+                by_key.setdefault(other_key, []).append(other)
+        # Walk whichever side is shorter: the drug's neighbours or the candidates
+        neighbours = self._neighbours(key)
+        candidates = [k for k in neighbours if k in by_key] if len(neighbours) < len(by_key) else by_key
+        partners = {}
+        for other_key in candidates:
+            outcomes = self._hits(key, other_key)
+            if outcomes:
+                for other in by_key[other_key]:
+                    partners[other] = list(outcomes)
+        return partners
+
+    def check_all_interactions(self, drug_list):
+        drug_list = normalize_drug_list(drug_list)
+        if len(drug_list) >= SCREEN_THRESHOLD:
+            return self._screen(drug_list)
+        return self._check_pairs(drug_list)
+
+    def screen_interactions(self, drug_list):
+        return self._screen(normalize_drug_list(drug_list))
+
+    def _check_pairs(self, drug_list):
+        keys = [self._key(d) for d in drug_list]
+        interactions = []
+        for i, j in combinations(range(len(drug_list)), 2):
+            if keys[i] is None or keys[j] is None:
+                continue
+            for severity, risk, recommendation in self._hits(keys[i], keys[j]):
+                interactions.append(make_result(drug_list[i], drug_list[j], severity, risk, recommendation))
+        return interactions
+
+    def _screen(self, drug_list):
+        # Walk each drug's adjacency list and keep only neighbours that are
+        # also in the input, so cost follows the number of real interactions
+        # instead of the number of pairs. Hits come out in the same order as
+        # the pairwise path.
+        keys = [self._key(d) for d in drug_list]
+        positions = {}
+        for i, key in enumerate(keys):
+            if key is not None:
+                positions.setdefault(key, []).append(i)
+        interactions = []
+        for i, k1 in enumerate(keys):
+            if k1 is None:
+                continue
+            partners = sorted(
+                j
+                for k2 in self._neighbours(k1)
+                if k2 in positions
+                for j in positions[k2]
+                if j > i
+            )
+            for j in partners:
+                for severity, risk, recommendation in self._hits(k1, keys[j]):
+                    interactions.append(make_result(drug_list[i], drug_list[j], severity, risk, recommendation))
+        return interactions
+
+
+def group_facts(facts):
+    index = {}
+    for d1, d2, severity, risk, recommendation in facts:
+        # Same guard as the pyDatalog path: incomplete facts never match
+        if not all([severity, risk, recommendation]):
+            continue
+        entries = index.setdefault(pair_key(d1, d2), [])
+        # pyDatalog answers are sets, so identical facts collapse to one hit
+        if (severity, risk, recommendation) not in entries:
+            entries.append((severity, risk, recommendation))
+    return {key: tuple(entries) for key, entries in index.items()}
+
+
+def build_adjacency(index):
+    adjacency = {}
+    for d1, d2 in index:
+        adjacency.setdefault(d1, set()).add(d2)
+        adjacency.setdefault(d2, set()).add(d1)
+    return {drug: frozenset(partners) for drug, partners in adjacency.items()}
+
+
+def index_backend(facts, version, start):
+    # `facts` must already have class inheritance materialized
+    index = group_facts(facts)
+    fact_count = sum(len(entries) for entries in index.values())
+    return IndexBackend(index, build_adjacency(index), fact_count, version, time.perf_counter() - start)
+
+
+def build_index(facts=None, memberships=None):
+    start = time.perf_counter()
+    facts = load_facts() if facts is None else facts
+    memberships = load_memberships() if memberships is None else memberships
+    # Class inheritance is resolved here, once, so queries stay plain lookups.
+    # Versioned by source content, like the datalog backend
+    return index_backend(materialize(facts, memberships), content_version(facts, memberships), start)
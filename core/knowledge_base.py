@@ -0,0 +1,131 @@
+import threading
+import time
+from itertools import combinations
+from core.facts import content_version, load_facts, load_memberships, normalize_drug
+
+# --- Backend Interface ---
+class InteractionBackend:
+    name = None
+    version = None
+
+    def check_interaction(self, d1, d2):
+        raise NotImplementedError
+
+    def drugs(self):
+        raise NotImplementedError
+
+    def pairs(self):
+        # Every interacting pair as (drug 1, drug 2, [(severity, risk, recommendation), ...]).
+        # Backends with a materialized table override this full scan.
+        for d1, d2 in combinations(self.drugs(), 2):
+            outcomes = self.check_interaction(d1, d2)
+            if outcomes:
+                yield d1, d2, outcomes
+
+    def interaction_partners(self, drug, others):
+        # {other: outcomes} for each of `others` that interacts with `drug`;
+        # lets a caller re-check one drug without redoing every pair
+        partners = {}
+        for other in others:
+            if other == drug:
+                continue
+            outcomes = [o for o in self.check_interaction(drug, other) if all(o)]
+            if outcomes:
+                partners[other] = outcomes
+        return partners
+
+    def check_all_interactions(self, drug_list):
+        drug_list = normalize_drug_list(drug_list)
+        interactions = []
+        for d1, d2 in combinations(drug_list, 2):
+            for severity, risk, recommendation in self.check_interaction(d1, d2):
+                # Extra guard: skip if any of them is None
+                if not all([severity, risk, recommendation]):
+                    continue
+                interactions.append(make_result(d1, d2, severity, risk, recommendation))
+        return interactions
+
+
+def normalize_drug_list(drug_list):
+    return [normalize_drug(d) for d in drug_list if d.strip()]
+
+
+def make_result(d1, d2, severity, risk, recommendation):
+    return {
+        'Drug 1': d1.title(),
+        'Drug 2': d2.title(),
+        'Severity': severity,
+        'Risk': risk,
+        'Recommendation': recommendation
+    }
+
+
+# --- Read-only Query Object (pyDatalog reference backend) ---
+class KnowledgeBase(InteractionBackend):
+    name = 'datalog'
+
+    def __init__(self, logic, check_interaction, drugs, fact_count, version, build_seconds):
+        self._logic = logic
+        self._check_interaction = check_interaction
+        self._drugs = drugs
+        self._local = threading.local()
+        self.fact_count = fact_count
+        self.version = version
+        self.build_seconds = build_seconds
+
+    def _activate(self):
+        from pyDatalog import Logic
+        # pyDatalog keeps its engine per thread; install a copy of ours in
+        # the calling thread once and reuse it for later queries.
+        installed = getattr(self._local, 'logic', None)
+        if installed is None or getattr(Logic.tl, 'logic', None) is not installed:
+            self._local.logic = Logic(self._logic)
+
+    def check_interaction(self, d1, d2):
+        self._activate()
+        from pyDatalog import pyDatalog
+        severity, risk, recommendation = pyDatalog.Variable(), pyDatalog.Variable(), pyDatalog.Variable()
+        self._check_interaction(d1, d2, severity, risk, recommendation)
+        return list(zip(severity.data, risk.data, recommendation.data))
+
+    def drugs(self):
+        return list(self._drugs)
+
+
+# --- Knowledge Base Construction ---
+def build_knowledge_base(facts=None, memberships=None):
+    # Imported here so the other backends (and the login page) never load pyDatalog
+    from pyDatalog import pyDatalog, Logic
+    start = time.perf_counter()
+    facts = load_facts() if facts is None else facts
+    memberships = load_memberships() if memberships is None else memberships
+    pyDatalog.clear()
+    interaction, check_interaction, is_a, in_class, linked, inherits = pyDatalog.create_terms(
+        'interaction, check_interaction, is_a, in_class, linked, inherits')
+    Severity, Risk, Recommendation, D1, D2, C1, C2 = pyDatalog.create_terms(
+        'Severity, Risk, Recommendation, D1, D2, C1, C2')
+
+    check_interaction(D1, D2, Severity, Risk, Recommendation) <= interaction(D1, D2, Severity, Risk, Recommendation)
+    check_interaction(D1, D2, Severity, Risk, Recommendation) <= interaction(D2, D1, Severity, Risk, Recommendation)
+
+    # Class inheritance: a drug takes on its classes' interactions unless the
+    # pair has facts of its own
+    in_class(D1, C1) <= is_a(D1, C1)
+    in_class(D1, C1) <= is_a(D1, C2) & in_class(C2, C1)
+    linked(D1, D2) <= interaction(D1, D2, Severity, Risk, Recommendation)
+    linked(D1, D2) <= interaction(D2, D1, Severity, Risk, Recommendation)
+    inherits(D1, D2, Severity, Risk, Recommendation) <= in_class(D1, C1) & interaction(C1, D2, Severity, Risk, Recommendation)
+    inherits(D1, D2, Severity, Risk, Recommendation) <= in_class(D2, C2) & interaction(D1, C2, Severity, Risk, Recommendation)
+    inherits(D1, D2, Severity, Risk, Recommendation) <= in_class(D1, C1) & in_class(D2, C2) & interaction(C1, C2, Severity, Risk, Recommendation)
+    check_interaction(D1, D2, Severity, Risk, Recommendation) <= inherits(D1, D2, Severity, Risk, Recommendation) & ~linked(D1, D2)
+    check_interaction(D1, D2, Severity, Risk, Recommendation) <= inherits(D2, D1, Severity, Risk, Recommendation) & ~linked(D1, D2)
+
+    for fact in facts:
+        pyDatalog.assert_fact('interaction', *fact)
+    for drug, cls in memberships:
+        pyDatalog.assert_fact('is_a', drug, cls)
+
+    logic = Logic(True)
+    drugs = sorted({drug for fact in facts for drug in fact[:2]} | {drug for drug, _ in memberships})
+    version = content_version(facts, memberships)
+    return KnowledgeBase(logic, check_interaction, drugs, len(facts), version, time.perf_counter() - start)
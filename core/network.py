@@ -0,0 +1,139 @@
+import numpy as np
+
+SEVERITY_RANK = {'low': 1, 'moderate': 2, 'high': 3}
+
+# Rows of the repulsion matrix processed at a time; bounds layout memory
+# to about LAYOUT_BLOCK * n * 24 bytes
+LAYOUT_BLOCK = 512
+
+
+# --- Whole-knowledge-base Graph ---
+def interaction_network(backend):
+    """Nodes (sorted drugs) and edges (i, j, worst severity, outcomes) for every interacting pair."""
+    edges = []
+    nodes = set()
+    for d1, d2, outcomes in backend.pairs():
+        if d1 == d2:
+            continue
+        worst = max((o[0] for o in outcomes), key=lambda s: SEVERITY_RANK.get(s.lower(), 0))
+        edges.append((d1, d2, worst, outcomes))
+        nodes.update((d1, d2))
+    nodes = sorted(nodes)
+    position = {drug: i for i, drug in enumerate(nodes)}
+    return nodes, [(position[d1], position[d2], worst, outcomes) for d1, d2, worst, outcomes in edges]
+
+
+# --- Force-directed Layout (Fruchterman-Reingold, vectorized) ---
+def force_layout(n_nodes, edge_index, iterations=50, seed=0, scale=1000.0):
+    if n_nodes == 0:
+        return np.zeros((0, 2))
+    rng = np.random.default_rng(seed)
+    pos = rng.random((n_nodes, 2)) - 0.5
+    k = np.sqrt(1.0 / n_nodes)
+    src = np.array([i for i, _ in edge_index], dtype=np.int64)
+    dst = np.array([j for _, j in edge_index], dtype=np.int64)
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        displacement = np.zeros_like(pos)
+        x, y = pos[:, 0], pos[:, 1]
+        for start in range(0, n_nodes, LAYOUT_BLOCK):
+            dx = x[start:start + LAYOUT_BLOCK, None] - x[None, :]
+            dy = y[start:start + LAYOUT_BLOCK, None] - y[None, :]
+            repulsion = k * k / np.maximum(dx * dx + dy * dy, 1e-4)
+            displacement[start:start + LAYOUT_BLOCK, 0] = (dx * repulsion).sum(axis=1)
+            displacement[start:start + LAYOUT_BLOCK, 1] = (dy * repulsion).sum(axis=1)
+        if len(src):
+            delta = pos[src] - pos[dst]
+            distance = np.maximum(np.linalg.norm(delta, axis=1), 0.01)
+            pull = delta * (distance / k)[:, None]
+            np.add.at(displacement, src, -pull)
+            np.add.at(displacement, dst, pull)
+        length = np.maximum(np.linalg.norm(displacement, axis=1), 0.01)
+        pos += displacement * (np.minimum(length, temperature) / length)[:, None]
+        temperature -= cooling
+    pos -= pos.mean(axis=0)
+    extent = np.abs(pos).max() or 1.0
+    return pos * (scale / extent)
+
+
+# --- Centrality and Structure ---
+def pagerank(n_nodes, edge_index, damping=0.85, iterations=100, tol=1e-9):
+    if n_nodes == 0:
+        return np.zeros(0)
+    src = np.array([i for i, j in edge_index] + [j for i, j in edge_index], dtype=np.int64)
+    dst = np.array([j for i, j in edge_index] + [i for i, j in edge_index], dtype=np.int64)
+    degree = np.bincount(src, minlength=n_nodes).astype(float)
+    rank = np.full(n_nodes, 1.0 / n_nodes)
+    for _ in range(iterations):
+        share = np.where(degree > 0, rank / np.maximum(degree, 1), 0.0)
+        spread = np.bincount(dst, weights=share[src], minlength=n_nodes)
+        dangling = rank[degree == 0].sum()
+        updated = (1 - damping) / n_nodes + damping * (spread + dangling / n_nodes)
+        if np.abs(updated - rank).sum() < tol:
+            return updated
+        rank = updated
+    return rank
+
+
+def connected_components(n_nodes, edge_index):
+    parent = list(range(n_nodes))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for i, j in edge_index:
+        ri, rj = find(i), find(j)
+        if ri != rj:
+            parent[ri] = rj
+    roots = {}
+    return [roots.setdefault(find(i), len(roots)) for i in range(n_nodes)]
+
+
+def node_degrees(n_nodes, edges):
+    degree = [0] * n_nodes
+    for i, j, _, _ in edges:
+        degree[i] += 1
+        degree[j] += 1
+    return degree
+
+
+def network_stats(nodes, edges):
+    n = len(nodes)
+    edge_index = [(i, j) for i, j, _, _ in edges]
+    degree = node_degrees(n, edges)
+    by_severity = [{'high': 0, 'moderate': 0, 'low': 0} for _ in range(n)]
+    for i, j, worst, _ in edges:
+        for node in (i, j):
+            if worst in by_severity[node]:
+                by_severity[node][worst] += 1
+    ranks = pagerank(n, edge_index)
+    components = connected_components(n, edge_index)
+    per_drug = [
+        {
+            'Drug': drug.title(),
+            'Degree': degree[i],
+            'Degree Centrality': degree[i] / (n - 1) if n > 1 else 0.0,
+            'High': by_severity[i]['high'],
+            'Moderate': by_severity[i]['moderate'],
+            'Low': by_severity[i]['low'],
+            'PageRank': float(ranks[i]),
+            'Cluster': components[i],
+        }
+        for i, drug in enumerate(nodes)
+    ]
+    per_drug.sort(key=lambda row: (-row['Degree'], -row['PageRank'], row['Drug']))
+    severity_counts = {'high': 0, 'moderate': 0, 'low': 0}
+    for _, _, worst, _ in edges:
+        severity_counts[worst] = severity_counts.get(worst, 0) + 1
+    summary = {
+        'nodes': n,
+        'edges': len(edges),
+        'clusters': len(set(components)),
+        'density': 2 * len(edges) / (n * (n - 1)) if n > 1 else 0.0,
+        'severity_counts': severity_counts,
+    }
+    return summary, per_drug
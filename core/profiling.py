@@ -0,0 +1,105 @@
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+logger = logging.getLogger('drug_interaction.timing')
+
+# Shared no-op context so a disabled profiler costs one attribute lookup per stage
+_DISABLED_STAGE = nullcontext()
+
+
+def profiling_mode():
+    # DEV_PROFILING=1 records stage timings, DEV_PROFILING=cprofile also captures a cProfile
+    mode = os.getenv('DEV_PROFILING', '').strip().lower()
+    if mode in ('', '0', 'false', 'off'):
+        return None
+    return 'cprofile' if mode == 'cprofile' else 'stages'
+
+
+def enable_logging():
+    # One JSON line per stage on stderr; Streamlit doesn't configure our loggers
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(asctime)s %(name)s %(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+
+
+# --- Process-wide Stage Counters ---
+class StageMetrics:
+    def __init__(self):
+        self._stages = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        with self._lock:
+            count, total, worst = self._stages.get(stage, (0, 0.0, 0.0))
+            self._stages[stage] = (count + 1, total + seconds, max(worst, seconds))
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                stage: {'count': count, 'total_ms': total * 1000, 'mean_ms': total / count * 1000, 'max_ms': worst * 1000}
+                for stage, (count, total, worst) in self._stages.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+
+metrics = StageMetrics()
+
+
+# --- Per-run Profiler ---
+class RunProfiler:
+    def __init__(self, run, mode=None):
+        self.run = run
+        self.mode = mode
+        self.enabled = mode is not None
+        self.stages = []
+        self.profile_text = None
+        self._profile = None
+
+    @contextmanager
+    def _timed(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.stages.append((name, seconds))
+            metrics.record(name, seconds)
+            logger.info(json.dumps({'run': self.run, 'stage': name, 'ms': round(seconds * 1000, 3)}))
+
+    def stage(self, name):
+        return self._timed(name) if self.enabled else _DISABLED_STAGE
+
+    def start(self):
+        if self.mode == 'cprofile':
+            self._profile = cProfile.Profile()
+            try:
+                self._profile.enable()
+            except ValueError:
+                # Another profiler (e.g. a debugger) already owns this thread
+                self._profile = None
+        return self
+
+    def stop(self, limit=25):
+        if self._profile is None:
+            return
+        self._profile.disable()
+        out = io.StringIO()
+        pstats.Stats(self._profile, stream=out).sort_stats('cumulative').print_stats(limit)
+        self.profile_text = out.getvalue()
+        self._profile = None
+
+    def total_seconds(self):
+        return sum(seconds for _, seconds in self.stages)
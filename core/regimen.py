@@ -0,0 +1,109 @@
+from core.facts import normalize_drug, pair_key
+
+# A pair scores by its worst outcome; the regimen score is the sum over pairs
+SEVERITY_WEIGHTS = {'high': 10, 'moderate': 4, 'low': 1}
+RISK_BANDS = [(0, 'none'), (1, 'low'), (10, 'moderate'), (20, 'high'), (40, 'very high')]
+
+
+def pair_score(outcomes):
+    return max(SEVERITY_WEIGHTS.get(severity, 1) for severity, _, _ in outcomes)
+
+
+def risk_band(score):
+    band = RISK_BANDS[0][1]
+    for floor, name in RISK_BANDS:
+        if score >= floor:
+            band = name
+    return band
+
+
+# --- Incrementally Scored Regimen ---
+class Regimen:
+    """Regimen risk score and per-drug burden, kept current one drug at a time.
+
+    Adding a drug checks it against the current members only; removing
+    one drops its pairs without touching the knowledge base.
+    """
+
+    def __init__(self, backend, drugs=()):
+        self.backend = backend
+        self.version = backend.version
+        self._drugs = {}
+        self._pairs = {}
+        self._burden = {}
+        self.score = 0
+        self.checks = 0
+        for drug in drugs:
+            self.add(drug)
+
+    @property
+    def drugs(self):
+        return list(self._drugs)
+
+    def add(self, drug):
+        drug = normalize_drug(drug)
+        if not drug or drug in self._drugs:
+            return False
+        partners = self.backend.interaction_partners(drug, list(self._drugs))
+        self.checks += len(self._drugs)
+        self._drugs[drug] = set()
+        self._burden[drug] = 0
+        for other, outcomes in partners.items():
+            score = pair_score(outcomes)
+            self._pairs[pair_key(drug, other)] = (score, outcomes)
+            self._drugs[drug].add(other)
+            self._drugs[other].add(drug)
+            self._burden[drug] += score
+            self._burden[other] += score
+            self.score += score
+        return True
+
+    def remove(self, drug):
+        drug = normalize_drug(drug)
+        if drug not in self._drugs:
+            return False
+        for other in self._drugs.pop(drug):
+            score, _ = self._pairs.pop(pair_key(drug, other))
+            self._drugs[other].discard(drug)
+            self._burden[other] -= score
+            self.score -= score
+        del self._burden[drug]
+        return True
+
+    def update(self, drugs):
+        # Apply the difference between the current members and `drugs`
+        wanted = [normalize_drug(d) for d in drugs if d.strip()]
+        wanted_set = set(wanted)
+        changed = False
+        for drug in [d for d in self._drugs if d not in wanted_set]:
+            changed |= self.remove(drug)
+        for drug in wanted:
+            changed |= self.add(drug)
+        return changed
+
+    def burden(self):
+        ranking = []
+        for drug, partners in self._drugs.items():
+            worst = max((self._pairs[pair_key(drug, other)][0] for other in partners), default=0)
+            ranking.append({
+                'Drug': drug.title(),
+                'Burden': self._burden[drug],
+                'Interactions': len(partners),
+                'Worst': next((s for s, w in SEVERITY_WEIGHTS.items() if w == worst), None),
+            })
+        ranking.sort(key=lambda row: (-row['Burden'], row['Drug']))
+        return ranking
+
+    def summary(self):
+        return {
+            'kb_version': self.version,
+            'score': self.score,
+            'band': risk_band(self.score),
+            'drugs': len(self._drugs),
+            'interacting_pairs': len(self._pairs),
+            'burden': self.burden(),
+        }
+
+
+def score_regimen(backend, drugs):
+    return Regimen(backend, drugs).summary()
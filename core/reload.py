@@ -0,0 +1,141 @@
+import logging
+import os
+import threading
+import time
+from core.backends import DEFAULT_BACKEND, build_backend
+from core.closure import ClassClosure
+from core.facts import CLASSES_PATH, SOURCE_PATH, content_version, load_facts, load_memberships
+from core.index import index_backend
+
+logger = logging.getLogger('drug_interaction.reload')
+
+WATCH_INTERVAL_SECONDS = 2.0
+# Above this many edits per source fact a full rebuild is cheaper than replaying the diff
+INCREMENTAL_MAX_CHANGE_RATIO = 0.1
+
+
+def source_stat(paths):
+    stats = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            stats.append((stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            stats.append(None)
+    return tuple(stats)
+
+
+# --- Hot-reloading Knowledge Base ---
+class KnowledgeBaseHolder:
+    """Serve the current backend and rebuild it in the background when its sources change.
+
+    Backends are immutable, so a reload builds a new one off the request
+    path and swaps the reference; callers that already took `current`
+    keep using the version they started with. The index backend keeps its
+    class closure and applies only the changed facts and memberships.
+    """
+
+    def __init__(self, backend=DEFAULT_BACKEND, source=SOURCE_PATH, classes=CLASSES_PATH,
+                 interval=WATCH_INTERVAL_SECONDS):
+        self.backend_name = backend
+        self.source = source
+        self.classes = classes
+        self.paths = (source, classes)
+        self.interval = interval
+        self._closure = None
+        self._stat = source_stat(self.paths)
+        self._current = self._build()
+        self._reload_lock = threading.Lock()
+        self._stop = threading.Event()
+        self.generation = 1
+        self.loaded_at = time.time()
+        self.last_error = None
+        self.incremental_reloads = 0
+        self._thread = None
+        if interval:
+            self._thread = threading.Thread(target=self._watch, name=f'kb-watch-{backend}', daemon=True)
+            self._thread.start()
+
+    @property
+    def current(self):
+        return self._current
+
+    def _build(self):
+        if self.backend_name == 'index':
+            start = time.perf_counter()
+            facts, memberships = load_facts(self.source), load_memberships(self.classes)
+            closure = ClassClosure(facts, memberships)
+            backend = index_backend(closure.facts(), content_version(facts, memberships), start)
+            self._closure = closure
+            return backend
+        if self.backend_name == 'compiled' and self.paths == (SOURCE_PATH, CLASSES_PATH):
+            # Reuses the on-disk artifact, recompiling it only when stale
+            return build_backend(self.backend_name)
+        return build_backend(self.backend_name, load_facts(self.source), load_memberships(self.classes))
+
+    def _rebuild(self):
+        if self._closure is None:
+            return self._build()
+        facts, memberships = load_facts(self.source), load_memberships(self.classes)
+        diff = self._closure.diff(facts, memberships)
+        edits = sum(len(part) for part in diff)
+        if not edits:
+            return self._current
+        if edits > max(1, len(facts)) * INCREMENTAL_MAX_CHANGE_RATIO:
+            return self._build()
+        try:
+            changed = self._closure.apply(diff)
+        except Exception:
+            # A half-applied closure can't be trusted; the next reload starts from scratch
+            self._closure = None
+            raise
+        self.incremental_reloads += 1
+        return self._current.with_changes(changed, content_version(facts, memberships))
+
+    def reload(self):
+        with self._reload_lock:
+            # Recorded up front so a broken source is retried on its next edit, not every poll
+            self._stat = source_stat(self.paths)
+            try:
+                backend = self._rebuild()
+            except Exception as e:
+                # A half-edited or malformed source keeps the last good version live
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.warning("Knowledge base reload failed, keeping v%s: %s", self._current.version, self.last_error)
+                return False
+            self.last_error = None
+            if backend.version != self._current.version:
+                self._current = backend
+                self.generation += 1
+                self.loaded_at = time.time()
+                logger.info("Knowledge base reloaded: %s v%s", backend.name, backend.version)
+            return True
+
+    def _watch(self):
+        pending = None
+        while not self._stop.wait(self.interval):
+            stat = source_stat(self.paths)
+            if stat == self._stat:
+                pending = None
+            elif stat == pending:
+                # Unchanged for a full interval, so the writer has most likely finished
+                self.reload()
+                pending = None
+            else:
+                pending = stat
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def status(self):
+        return {
+            'backend': self._current.name,
+            'version': self._current.version,
+            'generation': self.generation,
+            'loaded_at': self.loaded_at,
+            'watching': self._thread is not None,
+            'last_error': self.last_error,
+            'incremental_reloads': self.incremental_reloads,
+        }
@@ -0,0 +1,165 @@
+import csv
+import io
+import json
+from array import array
+
+RESULT_FIELDS = ['patient_id', 'Drug 1', 'Drug 2', 'Severity', 'Risk', 'Recommendation']
+SEVERITIES = ['high', 'moderate', 'low']
+EXPORT_FORMATS = {'csv': 'text/csv', 'jsonl': 'application/x-ndjson', 'parquet': 'application/vnd.apache.parquet'}
+EXPORT_CHUNK_ROWS = 10_000
+
+
+# --- Interned Strings ---
+class StringPool:
+    def __init__(self, values=()):
+        self.values = []
+        self._ids = {}
+        for value in values:
+            self.intern(value)
+
+    def intern(self, value):
+        code = self._ids.get(value)
+        if code is None:
+            code = self._ids[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def __len__(self):
+        return len(self.values)
+
+
+# --- Columnar Result Set ---
+class ResultTable:
+    """Interaction results as parallel integer columns over interned strings.
+
+    Each row costs a few bytes of codes; drug names, risks and
+    recommendations are stored once however many rows repeat them.
+    """
+
+    def __init__(self):
+        self.patients = StringPool()
+        self.drugs = StringPool()
+        self.texts = StringPool()
+        self.severities = StringPool(SEVERITIES)
+        self.patient = array('i')
+        self.drug_1 = array('i')
+        self.drug_2 = array('i')
+        self.severity = array('B')
+        self.risk = array('i')
+        self.recommendation = array('i')
+
+    @classmethod
+    def from_results(cls, interactions, patient_id=None):
+        table = cls()
+        table.append(patient_id, interactions)
+        return table
+
+    def append(self, patient_id, interactions):
+        patient = self.patients.intern('' if patient_id is None else str(patient_id))
+        for interaction in interactions:
+            self.patient.append(patient)
+            self.drug_1.append(self.drugs.intern(interaction['Drug 1']))
+            self.drug_2.append(self.drugs.intern(interaction['Drug 2']))
+            self.severity.append(self.severities.intern(interaction['Severity']))
+            self.risk.append(self.texts.intern(interaction['Risk']))
+            self.recommendation.append(self.texts.intern(interaction['Recommendation']))
+
+    def __len__(self):
+        return len(self.severity)
+
+    def nbytes(self):
+        columns = (self.patient, self.drug_1, self.drug_2, self.severity, self.risk, self.recommendation)
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def severity_counts(self):
+        # Severity codes are single bytes, so bytes.count tallies each one in C
+        codes = self.severity.tobytes()
+        counts = {severity: codes.count(code) for code, severity in enumerate(self.severities.values)}
+        return {severity: count for severity, count in counts.items() if count}
+
+    def rows(self, start=0, stop=None, with_patient=False):
+        drugs, texts, severities, patients = (self.drugs.values, self.texts.values, self.severities.values,
+                                              self.patients.values)
+        for i in range(start, len(self) if stop is None else min(stop, len(self))):
+            row = {
+                'Drug 1': drugs[self.drug_1[i]],
+                'Drug 2': drugs[self.drug_2[i]],
+                'Severity': severities[self.severity[i]],
+                'Risk': texts[self.risk[i]],
+                'Recommendation': texts[self.recommendation[i]],
+            }
+            yield {'patient_id': patients[self.patient[i]], **row} if with_patient else row
+
+    def to_dataframe(self, with_patient=False):
+        import pandas as pd
+
+        def categorical(codes, pool):
+            return pd.Categorical.from_codes(codes, categories=pool.values) if len(pool) else pd.Categorical([])
+
+        columns = {
+            'Drug 1': categorical(self.drug_1, self.drugs),
+            'Drug 2': categorical(self.drug_2, self.drugs),
+            'Severity': categorical(self.severity, self.severities),
+            'Risk': categorical(self.risk, self.texts),
+            'Recommendation': categorical(self.recommendation, self.texts),
+        }
+        if with_patient:
+            columns = {'patient_id': categorical(self.patient, self.patients), **columns}
+        return pd.DataFrame(columns)
+
+    def arrow_batches(self, chunk_rows=EXPORT_CHUNK_ROWS, with_patient=False):
+        import pyarrow as pa
+
+        def dictionary(column, pool, start, stop):
+            return pa.DictionaryArray.from_arrays(pa.array(column[start:stop], type=pa.int32()),
+                                                  pa.array(pool.values, type=pa.string()))
+
+        columns = [('Drug 1', self.drug_1, self.drugs), ('Drug 2', self.drug_2, self.drugs),
+                   ('Severity', self.severity, self.severities), ('Risk', self.risk, self.texts),
+                   ('Recommendation', self.recommendation, self.texts)]
+        if with_patient:
+            columns.insert(0, ('patient_id', self.patient, self.patients))
+        for start in range(0, len(self), chunk_rows):
+            stop = start + chunk_rows
+            yield pa.RecordBatch.from_arrays([dictionary(column, pool, start, stop) for _, column, pool in columns],
+                                             names=[name for name, _, _ in columns])
+
+
+# --- Streaming Exporters (one chunk of rows in memory at a time) ---
+def write_csv(table, f, with_patient=False, chunk_rows=EXPORT_CHUNK_ROWS):
+    fields = RESULT_FIELDS if with_patient else RESULT_FIELDS[1:]
+    writer = csv.DictWriter(f, fieldnames=fields)
+    writer.writeheader()
+    for start in range(0, len(table), chunk_rows):
+        writer.writerows(table.rows(start, start + chunk_rows, with_patient))
+
+
+def write_jsonl(table, f, with_patient=False, chunk_rows=EXPORT_CHUNK_ROWS):
+    for start in range(0, len(table), chunk_rows):
+        f.write(''.join(json.dumps(row) + '\n' for row in table.rows(start, start + chunk_rows, with_patient)))
+
+
+def write_parquet(table, f, with_patient=False, chunk_rows=EXPORT_CHUNK_ROWS):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    batches = table.arrow_batches(chunk_rows, with_patient)
+    first = next(batches, None)
+    if first is None:
+        fields = RESULT_FIELDS if with_patient else RESULT_FIELDS[1:]
+        pq.write_table(pa.table({name: pa.array([], type=pa.string()) for name in fields}), f)
+        return
+    with pq.ParquetWriter(f, first.schema) as writer:
+        writer.write_batch(first)
+        for batch in batches:
+            writer.write_batch(batch)
+
+
+def export_bytes(table, fmt, with_patient=False):
+    if fmt == 'parquet':
+        out = io.BytesIO()
+        write_parquet(table, out, with_patient)
+        return out.getvalue()
+    out = io.StringIO(newline='')
+    (write_csv if fmt == 'csv' else write_jsonl)(table, out, with_patient)
+    return out.getvalue().encode('utf-8')
@@ -0,0 +1,239 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from http import HTTPStatus
+from urllib.parse import urlsplit
+from core.backends import BACKENDS, DEFAULT_BACKEND, build_backend
+from core.alternatives import AlternativeIndex
+from core.cache import ResultCache
+from core.regimen import score_regimen
+from core.reload import KnowledgeBaseHolder
+from core.set_rules import SetRulesHolder
+from core.vocabulary import build_vocabulary
+
+logger = logging.getLogger('drug_interaction.service')
+
+MAX_BODY_BYTES = 10 * 1024 * 1024
+MAX_BULK_PATIENTS = 10000
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def drug_list(drugs):
+    if not isinstance(drugs, list) or not all(isinstance(d, str) for d in drugs):
+        raise HttpError(HTTPStatus.BAD_REQUEST, "'drugs' must be a list of strings")
+    return drugs
+
+
+# --- Interaction Service (stdlib asyncio HTTP/1.1 with keep-alive) ---
+class InteractionService:
+    def __init__(self, backend, cache_size=4096, holder=None):
+        # With a holder the backend follows hot reloads; each request keeps the version it started on
+        self._backend = backend
+        self._holder = holder
+        self._vocabulary = (backend.version, build_vocabulary(backend))
+        self._alternatives = (None, None)
+        self.set_rules_holder = SetRulesHolder()
+        self.cache = ResultCache(maxsize=cache_size)
+        self.started = time.time()
+
+    @property
+    def backend(self):
+        return self._holder.current if self._holder else self._backend
+
+    def snapshot(self):
+        backend = self.backend
+        version, vocabulary = self._vocabulary
+        if version != backend.version:
+            vocabulary = build_vocabulary(backend)
+            self._vocabulary = (backend.version, vocabulary)
+        return backend, vocabulary
+
+    @property
+    def set_rules(self):
+        return self.set_rules_holder.current
+
+    def check(self, drugs, snapshot=None):
+        drugs = drug_list(drugs)
+        backend, vocabulary = snapshot or self.snapshot()
+        return self.cache.check_all_interactions(backend, vocabulary.resolve_all(drugs))
+
+    # --- Endpoints ---
+    def health(self, _payload):
+        backend = self.backend
+        return {
+            'status': 'ok',
+            'backend': backend.name,
+            'kb_version': backend.version,
+            'facts': backend.fact_count,
+            'kb_reload': self._holder.status() if self._holder else None,
+            'set_rules_error': self.set_rules_holder.last_error,
+            'uptime_seconds': round(time.time() - self.started, 1),
+            'cache': self.cache.stats(),
+        }
+
+    def check_one(self, payload):
+        snapshot = self.snapshot()
+        interactions = self.check(payload.get('drugs'), snapshot)
+        return {'kb_version': snapshot[0].version, 'interactions': interactions,
+                'multi_drug': self.set_rules.evaluate(snapshot[1].resolve_all(payload['drugs']))}
+
+    def check_bulk(self, payload):
+        patients = payload.get('patients')
+        if not isinstance(patients, list):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "'patients' must be a list")
+        if len(patients) > MAX_BULK_PATIENTS:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"At most {MAX_BULK_PATIENTS} patients per request")
+        snapshot = self.snapshot()
+        results = []
+        for patient in patients:
+            if not isinstance(patient, dict):
+                raise HttpError(HTTPStatus.BAD_REQUEST, "Each patient must be an object")
+            results.append({'patient_id': patient.get('patient_id'),
+                            'interactions': self.check(patient.get('drugs'), snapshot)})
+        return {'kb_version': snapshot[0].version, 'results': results}
+
+    def score(self, payload):
+        drugs = drug_list(payload.get('drugs'))
+        backend, vocabulary = self.snapshot()
+        return score_regimen(backend, vocabulary.resolve_all(drugs))
+
+    def alternatives(self, payload):
+        drugs = drug_list(payload.get('drugs'))
+        backend, vocabulary = self.snapshot()
+        version, index = self._alternatives
+        if version != backend.version:
+            index = AlternativeIndex(backend)
+            self._alternatives = (backend.version, index)
+        return {'kb_version': backend.version, 'alternatives': index.suggest_for_regimen(vocabulary.resolve_all(drugs))}
+
+    ROUTES = {
+        ('GET', '/health'): ('health', False),
+        ('POST', '/v1/check'): ('check_one', False),
+        ('POST', '/v1/score'): ('score', False),
+        ('POST', '/v1/alternatives'): ('alternatives', False),
+        # Bulk requests run in a worker thread so one large batch can't stall other connections
+        ('POST', '/v1/check/bulk'): ('check_bulk', True),
+    }
+
+    async def dispatch(self, method, path, body):
+        route = self.ROUTES.get((method, path))
+        if route is None:
+            allowed = [m for m, p in self.ROUTES if p == path]
+            if allowed:
+                raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, f"Use {', '.join(allowed)} for {path}")
+            raise HttpError(HTTPStatus.NOT_FOUND, f"No endpoint at {path}")
+        handler_name, offload = route
+        payload = {}
+        if body:
+            try:
+                payload = json.loads(body)
+            except ValueError:
+                raise HttpError(HTTPStatus.BAD_REQUEST, "Request body must be JSON")
+            if not isinstance(payload, dict):
+                raise HttpError(HTTPStatus.BAD_REQUEST, "Request body must be a JSON object")
+        handler = getattr(self, handler_name)
+        if offload:
+            return await asyncio.get_running_loop().run_in_executor(None, handler, payload)
+        return handler(payload)
+
+    # --- HTTP Plumbing ---
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {'error': 'Malformed request line'}, False)
+                    break
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = line.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {'error': 'Invalid Content-Length'}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {'error': 'Body too large'}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+
+                try:
+                    status, result = HTTPStatus.OK, await self.dispatch(method, urlsplit(target).path, body)
+                except HttpError as error:
+                    status, result = error.status, {'error': str(error)}
+                except Exception:
+                    # A bug in one handler answers that request with a 500; the connection and server stay up
+                    logger.exception("Unhandled error in %s %s", method, target)
+                    status, result = HTTPStatus.INTERNAL_SERVER_ERROR, {'error': 'Internal server error'}
+                await self._respond(writer, status, result, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, result, keep_alive):
+        body = json.dumps(result).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+        await writer.drain()
+
+
+async def serve(service, host, port):
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"Serving {service.backend.name} KB v{service.backend.version} on http://{host}:{port}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+# --- Command Line ---
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP JSON service for drug interaction checks.")
+    parser.add_argument('--host', default=os.getenv("SERVICE_HOST", "127.0.0.1"))
+    parser.add_argument('--port', type=int, default=int(os.getenv("SERVICE_PORT", "8080")))
+    parser.add_argument('--backend', choices=sorted(BACKENDS), default=os.getenv("INTERACTION_BACKEND", DEFAULT_BACKEND))
+    parser.add_argument('--cache-size', type=int, default=4096)
+    parser.add_argument('--watch', type=float, default=float(os.getenv("KB_WATCH_INTERVAL", "0")),
+                        help="reload the knowledge base when data/ changes, polling every N seconds (0: off)")
+    args = parser.parse_args(argv)
+
+    if args.watch:
+        holder = KnowledgeBaseHolder(args.backend, interval=args.watch)
+        service = InteractionService(holder.current, cache_size=args.cache_size, holder=holder)
+    else:
+        service = InteractionService(build_backend(args.backend), cache_size=args.cache_size)
+    try:
+        asyncio.run(serve(service, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+import logging
+import threading
+from core.closure import ClassHierarchy
+from core.facts import (ATTRIBUTES_PATH, CLASSES_PATH, SET_RULES_PATH, load_attributes, load_memberships,
+                        load_set_rules, normalize_drug)
+from core.knowledge_base import normalize_drug_list
+from core.reload import source_stat
+
+logger = logging.getLogger('drug_interaction.set_rules')
+
+SET_RULE_PATHS = (SET_RULES_PATH, ATTRIBUTES_PATH, CLASSES_PATH)
+
+
+def parse_requirements(requires):
+    terms = {}
+    for term in requires.split('+'):
+        count, _, attribute = term.strip().rpartition('*')
+        attribute = normalize_drug(attribute)
+        if not attribute:
+            raise ValueError(f"Empty term in rule requirement '{requires}'")
+        terms[attribute] = max(terms.get(attribute, 0), int(count) if count else 1)
+    return terms
+
+
+# --- Multi-drug Set Rules ---
+class SetRuleEngine:
+    """Rules over attribute counts in a drug list ("3*serotonergic + tramadol").
+
+    Every drug maps to a bitmask of attributes, so a list is screened with
+    one pass over its drugs to count attributes, and a rule is only looked
+    at when all of its attributes are present at least once.
+    """
+
+    def __init__(self, rules, attributes, memberships=()):
+        self.rules = []
+        self._bits = {}
+        for rule_id, requires, severity, risk, recommendation in rules:
+            terms = parse_requirements(requires)
+            mask = 0
+            for attribute in terms:
+                mask |= self._bit(attribute)
+            self.rules.append((rule_id, terms, mask, severity, risk, recommendation))
+
+        # Attributes stated on a class apply to every drug in it, transitively
+        hierarchy = ClassHierarchy(memberships)
+        direct = {}
+        for drug, attribute in attributes:
+            direct.setdefault(drug, set()).add(attribute)
+        self._masks = {}
+        for drug in set(direct) | set(hierarchy.parents):
+            mask = 0
+            for node in hierarchy.ancestors(drug):
+                for attribute in direct.get(node, ()):
+                    mask |= self._bit(attribute)
+            self._masks[drug] = mask
+
+    def _bit(self, attribute):
+        if attribute not in self._bits:
+            self._bits[attribute] = 1 << len(self._bits)
+        return self._bits[attribute]
+
+    def drug_mask(self, drug):
+        # A drug named in a rule counts as its own attribute
+        return self._masks.get(drug, 0) | self._bits.get(drug, 0)
+
+    def evaluate(self, drug_list):
+        drugs = list(dict.fromkeys(normalize_drug_list(drug_list)))
+        masks = [self.drug_mask(drug) for drug in drugs]
+        present = 0
+        for mask in masks:
+            present |= mask
+        counts = {}
+        hits = []
+        for rule_id, terms, rule_mask, severity, risk, recommendation in self.rules:
+            if rule_mask & present != rule_mask:
+                continue
+            if not counts:
+                for mask in masks:
+                    while mask:
+                        low = mask & -mask
+                        counts[low] = counts.get(low, 0) + 1
+                        mask ^= low
+            if all(counts.get(self._bits[attribute], 0) >= n for attribute, n in terms.items()):
+                involved = [drug for drug, mask in zip(drugs, masks) if mask & rule_mask]
+                hits.append({
+                    'Rule': rule_id,
+                    'Drugs': [drug.title() for drug in involved],
+                    'Severity': severity,
+                    'Risk': risk,
+                    'Recommendation': recommendation,
+                })
+        return hits
+
+
+def build_set_rules(rules=None, attributes=None, memberships=None):
+    return SetRuleEngine(
+        load_set_rules() if rules is None else rules,
+        load_attributes() if attributes is None else attributes,
+        load_memberships() if memberships is None else memberships,
+    )
+
+
+# --- Reloading Rule Engine (shared by the page and the service) ---
+class SetRulesHolder:
+    """The current rule engine, rebuilt on first use after one of its files changes.
+
+    The files are tiny, so a changed stat simply rebuilds the whole engine.
+    A malformed file keeps the last good engine and records the error.
+    """
+
+    def __init__(self, rules=SET_RULES_PATH, attributes=ATTRIBUTES_PATH, classes=CLASSES_PATH):
+        self.paths = (rules, attributes, classes)
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._stat = source_stat(self.paths)
+        self._engine = SetRuleEngine([], [])
+        self._rebuild()
+
+    def _rebuild(self):
+        rules, attributes, classes = self.paths
+        try:
+            engine = build_set_rules(load_set_rules(rules), load_attributes(attributes), load_memberships(classes))
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            logger.warning("Set rules reload failed, keeping the previous rules: %s", self.last_error)
+            return
+        self.last_error = None
+        self._engine = engine
+
+    @property
+    def current(self):
+        stat = source_stat(self.paths)
+        if stat != self._stat:
+            with self._lock:
+                if stat != self._stat:
+                    # Recorded even on failure, so a broken file is retried on its next edit only
+                    self._stat = stat
+                    self._rebuild()
+        return self._engine
@@ -0,0 +1,86 @@
+import hashlib
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+DEFAULT_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'drug_interaction_tts')
+
+# --- Worker Process: one pyttsx3 engine per process, reused for every phrase ---
+_engine = None
+
+
+def _init_engine():
+    global _engine
+    import pyttsx3
+    _engine = pyttsx3.init()
+
+
+def _render(text, path):
+    tmp_path = f"{path}.{os.getpid()}.tmp.wav"
+    _engine.save_to_file(text, tmp_path)
+    _engine.runAndWait()
+    if not os.path.exists(tmp_path) or os.path.getsize(tmp_path) == 0:
+        raise RuntimeError("Speech engine produced no audio")
+    os.replace(tmp_path, path)
+    return path
+
+
+# --- Background Renderer with On-disk Cache ---
+class SpeechRenderer:
+    """Renders phrases to audio files in worker processes, once per distinct text.
+
+    Nothing here blocks the caller: request() queues work and audio_path()
+    only returns a file once it exists.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, workers=1):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        # spawn: forking a threaded web server process is not safe
+        self._pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'),
+                                         initializer=_init_engine)
+        self._pending = {}
+        self._failed = {}
+        self._lock = threading.Lock()
+        # Set once the engine cannot start at all (e.g. no speech driver on the host)
+        self.unavailable = None
+
+    def path_for(self, text):
+        digest = hashlib.sha256(text.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.wav")
+
+    def request(self, text):
+        path = self.path_for(text)
+        with self._lock:
+            if self.unavailable or os.path.exists(path) or path in self._pending or path in self._failed:
+                return
+            try:
+                future = self._pool.submit(_render, text, path)
+            except BrokenProcessPool:
+                self.unavailable = "Speech engine is not available on this server"
+                return
+            self._pending[path] = future
+        future.add_done_callback(lambda f, path=path: self._finish(path, f))
+
+    def _finish(self, path, future):
+        with self._lock:
+            self._pending.pop(path, None)
+            error = future.exception()
+            if isinstance(error, BrokenProcessPool):
+                self.unavailable = "Speech engine is not available on this server"
+            elif error is not None:
+                self._failed[path] = str(error) or type(error).__name__
+
+    def audio_path(self, text):
+        path = self.path_for(text)
+        return path if os.path.exists(path) else None
+
+    def error(self, text):
+        with self._lock:
+            return self.unavailable or self._failed.get(self.path_for(text))
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
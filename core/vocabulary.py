@@ -0,0 +1,85 @@
+import re
+from bisect import bisect_left
+from collections import Counter
+from itertools import chain
+from core.facts import load_synonyms, normalize_drug
+
+# Fuzzy matches below this trigram similarity are not offered
+MIN_SIMILARITY = 0.3
+
+
+def term_key(name):
+    # 'Grapefruit juice', 'grapefruit-juice' and 'grapefruit_juice' are the same term
+    return re.sub(r'[\s\-]+', '_', normalize_drug(name))
+
+
+def trigrams(key):
+    padded = f'  {key} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# --- Drug Vocabulary with Prefix, Trigram and Synonym Indexes ---
+class Vocabulary:
+    def __init__(self, drugs, synonyms=None):
+        self.drugs = sorted(set(drugs))
+        known = set(self.drugs)
+        canonical = {term_key(drug): drug for drug in self.drugs}
+        for synonym, drug in (synonyms or {}).items():
+            # Synonyms pointing outside the knowledge base would never match
+            if drug in known:
+                canonical.setdefault(term_key(synonym), drug)
+        self._canonical = canonical
+        self._terms = sorted(canonical)
+        self._term_grams = [trigrams(term) for term in self._terms]
+        self._postings = {}
+        for term_id, grams in enumerate(self._term_grams):
+            for gram in grams:
+                self._postings.setdefault(gram, []).append(term_id)
+
+    def __len__(self):
+        return len(self.drugs)
+
+    def resolve(self, name):
+        return self._canonical.get(term_key(name))
+
+    def resolve_all(self, names):
+        # Unknown names pass through so they still show up as checked drugs
+        return [self.resolve(name) or normalize_drug(name) for name in names if name.strip()]
+
+    def prefix_matches(self, prefix):
+        key = term_key(prefix)
+        terms = self._terms
+        i = bisect_left(terms, key)
+        while i < len(terms) and terms[i].startswith(key):
+            yield terms[i]
+            i += 1
+
+    def fuzzy_matches(self, query):
+        grams = trigrams(term_key(query))
+        shared = Counter(term_id for gram in grams for term_id in self._postings.get(gram, ()))
+        scored = []
+        for term_id, count in shared.items():
+            similarity = count / (len(grams) + len(self._term_grams[term_id]) - count)
+            if similarity >= MIN_SIMILARITY:
+                scored.append((-similarity, self._terms[term_id]))
+        scored.sort()
+        for _, term in scored:
+            yield term
+
+    def search(self, query, limit=20):
+        """Canonical drugs for a typed query: exact, then prefix, then fuzzy matches."""
+        if not query.strip():
+            return self.drugs[:limit]
+        results = []
+        # Generators: fuzzy scoring only runs if exact and prefix hits fall short
+        for term in chain([term_key(query)], self.prefix_matches(query), self.fuzzy_matches(query)):
+            drug = self._canonical.get(term)
+            if drug is not None and drug not in results:
+                results.append(drug)
+                if len(results) >= limit:
+                    break
+        return results
+
+
+def build_vocabulary(backend, synonyms=None):
+    return Vocabulary(backend.drugs(), load_synonyms() if synonyms is None else synonyms)
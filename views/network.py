@@ -0,0 +1,67 @@
+import streamlit as st
+from core.graph import render_network_json
+from views.resources import (
+    current_backend_name, current_user, load_knowledge_base, show_graph, show_profiler_panel, start_profiler,
+)
+
+# --- Redirect to login if not authenticated ---
+if current_user() is None:
+    st.warning("🔐 Please log in on the **Drug Interaction** page to explore the network.")
+    st.stop()
+
+# --- Network, Layout and Statistics (computed once per KB version) ---
+@st.cache_resource(show_spinner="Computing network layout...", max_entries=2)
+def load_network(_kb, backend, version):
+    from core.network import force_layout, interaction_network, network_stats, node_degrees
+    nodes, edges = interaction_network(_kb)
+    positions = force_layout(len(nodes), [(i, j) for i, j, _, _ in edges])
+    summary, per_drug = network_stats(nodes, edges)
+    graph = render_network_json(nodes, edges, positions, node_degrees(len(nodes), edges))
+    return summary, per_drug, graph
+
+profiler = start_profiler("network")
+with profiler.stage("load_network"):
+    backend_name = current_backend_name()
+    kb = load_knowledge_base(backend_name)
+    summary, per_drug, graph = load_network(kb, backend_name, kb.version)
+
+# --- UI Layout ---
+st.title("🕸️ Interaction Network")
+st.markdown("The whole knowledge base as one graph. Edge colour shows the **worst severity** for each pair; node size shows how many drugs it interacts with.")
+
+k1, k2, k3, k4 = st.columns(4)
+k1.metric("💊 Drugs", summary['nodes'])
+k2.metric("🔗 Interactions", summary['edges'])
+k3.metric("🧩 Clusters", summary['clusters'])
+k4.metric("📐 Density", f"{summary['density']:.3f}")
+
+s1, s2, s3 = st.columns(3)
+s1.metric("🔴 High Severity", summary['severity_counts'].get('high', 0))
+s2.metric("🟠 Moderate Severity", summary['severity_counts'].get('moderate', 0))
+s3.metric("🟢 Low Severity", summary['severity_counts'].get('low', 0))
+
+show_graph(graph, height=750, key="kb_network")
+
+# --- Hubs and Centrality ---
+import pandas as pd
+st.subheader("📈 Hubs and Centrality")
+query = st.text_input("Filter drugs:", key="network_filter")
+with profiler.stage("hub_table"):
+    df = pd.DataFrame(per_drug)
+    if query:
+        df = df[df['Drug'].str.contains(query, case=False, regex=False)]
+st.dataframe(
+    df,
+    hide_index=True,
+    use_container_width=True,
+    column_config={
+        'Degree Centrality': st.column_config.NumberColumn(format="%.3f"),
+        'PageRank': st.column_config.NumberColumn(format="%.4f"),
+    },
+)
+
+# --- Footer ---
+st.markdown("---")
+st.caption(f"Layout computed server-side once per knowledge-base version ({kb.name} v{kb.version}).")
+
+show_profiler_panel(profiler)
@@ -0,0 +1,109 @@
+import streamlit as st
+import streamlit.components.v1 as components
+import os
+from core.alternatives import AlternativeIndex
+from core.auth import LoginRateLimiter, SessionTokens, load_user_store
+from core.backends import DEFAULT_BACKEND
+from core.cache import ResultCache
+from core.graph import VIS_COMPONENT_DIR
+from core.profiling import RunProfiler, enable_logging, metrics, profiling_mode
+from core.reload import WATCH_INTERVAL_SECONDS, KnowledgeBaseHolder
+from core.set_rules import SetRulesHolder
+from core.speech import DEFAULT_CACHE_DIR, SpeechRenderer
+from core.vocabulary import build_vocabulary
+
+# Process-wide resources shared by every page and session (not a page itself)
+
+def current_backend_name():
+    return os.getenv("INTERACTION_BACKEND", DEFAULT_BACKEND)
+
+# --- Authentication (users loaded once; a logged-in session carries a token) ---
+@st.cache_resource
+def load_users():
+    return load_user_store()
+
+@st.cache_resource
+def load_login_limiter():
+    return LoginRateLimiter()
+
+@st.cache_resource
+def load_session_tokens():
+    return SessionTokens()
+
+def current_user():
+    token = st.session_state.get("auth_token")
+    user = load_session_tokens().user(token)
+    if user is None and token:
+        # Expired or revoked elsewhere: forget it so this session starts clean at the login form
+        del st.session_state["auth_token"]
+    return user
+
+def logout():
+    load_session_tokens().revoke(st.session_state.pop("auth_token", None))
+
+# --- Knowledge Base (built once per server process, rebuilt in the background when data/ changes) ---
+@st.cache_resource
+def load_kb_holder(backend):
+    return KnowledgeBaseHolder(backend, interval=float(os.getenv("KB_WATCH_INTERVAL", WATCH_INTERVAL_SECONDS)))
+
+# Take this once per script run: the run keeps its version even if a reload lands midway
+def load_knowledge_base(backend):
+    return load_kb_holder(backend).current
+
+@st.cache_resource(max_entries=2)
+def load_vocabulary(_kb, backend, version):
+    return build_vocabulary(_kb)
+
+# Class membership and adjacency bitsets for same-class substitutes
+@st.cache_resource(max_entries=2)
+def load_alternatives(_kb, backend, version):
+    return AlternativeIndex(_kb)
+
+# Multi-drug rules follow edits to their files; a broken edit keeps the last good rules
+@st.cache_resource
+def load_set_rules_holder():
+    return SetRulesHolder()
+
+# Shared by every session in this process; cleared when the KB version changes
+@st.cache_resource
+def load_result_cache():
+    return ResultCache(maxsize=int(os.getenv("RESULT_CACHE_SIZE", "1024")))
+
+# Text-to-speech runs in background worker processes; audio files are cached on disk by text
+@st.cache_resource
+def load_speech_renderer():
+    return SpeechRenderer(os.getenv("TTS_CACHE_DIR", DEFAULT_CACHE_DIR), workers=int(os.getenv("TTS_WORKERS", "1")))
+
+# --- Interaction Graphs (vis-network assets served once as component files, then browser-cached) ---
+_vis_network = components.declare_component("vis_network", path=VIS_COMPONENT_DIR)
+
+def show_graph(graph_json, height, key=None):
+    _vis_network(graph=graph_json, height=height, key=key, default=None)
+
+# --- Developer Profiling (off unless DEV_PROFILING is set) ---
+def start_profiler(run):
+    mode = profiling_mode()
+    if mode:
+        enable_logging()
+    return RunProfiler(run, mode).start()
+
+def show_profiler_panel(profiler):
+    if not profiler.enabled:
+        return
+    profiler.stop()
+    with st.sidebar.expander("🛠️ Developer: stage timings"):
+        st.caption(f"This run: {profiler.total_seconds() * 1000:.1f} ms across {len(profiler.stages)} stages")
+        st.dataframe(
+            [{'Stage': name, 'ms': round(seconds * 1000, 2)} for name, seconds in profiler.stages],
+            hide_index=True,
+            use_container_width=True,
+        )
+        st.caption("Process totals")
+        st.dataframe(
+            [{'Stage': name, 'Runs': m['count'], 'Mean ms': round(m['mean_ms'], 2), 'Max ms': round(m['max_ms'], 2)}
+             for name, m in metrics.snapshot().items()],
+            hide_index=True,
+            use_container_width=True,
+        )
+        if profiler.profile_text:
+            st.code(profiler.profile_text, language=None)